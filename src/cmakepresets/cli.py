@@ -1,22 +1,45 @@
 import argparse
+import functools
 import json
 import sys
-from typing import Any, Final
-
-from rich.table import Table
-from rich.tree import Tree
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING, Any, Final, cast
 
 from . import console, log
 from . import logger as mainLogger
-from .constants import BUILD, CONFIGURE, PACKAGE, PRESET_MAP, PRESET_TYPES, TEST, WORKFLOW
+from .constants import BUILD, BUILD_KEY, CONFIGURE, PACKAGE, PRESET_TYPES, TEST, TEST_KEY, WORKFLOW
 from .paths import CMakeRoot
 from .presets import CMakePresets
 
+if TYPE_CHECKING:
+    from rich.table import Table
+    from rich.tree import Tree
+
 logger: Final = mainLogger.getChild(__name__)
 
 
-def create_parser() -> argparse.ArgumentParser:
-    """Create the command-line argument parser."""
+def create_parser(argv: Sequence[str] | None = None) -> argparse.ArgumentParser:
+    """
+    Create the command-line argument parser.
+
+    Only the subcommand named in the arguments gets its parser populated. All of them are
+    built when no (or an unknown) subcommand is given, so help and error output stay complete.
+
+    Parsers are built once per subcommand and reused, since parsing does not modify them.
+
+    Args:
+        argv: Arguments that will be parsed, used to pick the subcommand (default: sys.argv[1:])
+
+    Returns:
+        The argument parser
+    """
+    command = _peek_command(sys.argv[1:] if argv is None else argv)
+    return _build_parser(command if command in _SUBCOMMAND_BUILDERS else None)
+
+
+@functools.cache
+def _build_parser(command: str | None) -> argparse.ArgumentParser:
+    """Build the argument parser with the given subcommand, or all of them when None."""
     parser = argparse.ArgumentParser(description="CMake Presets utility for working with CMakePresets.json files")
 
     # Source group (file or directory)
@@ -30,7 +53,34 @@ def create_parser() -> argparse.ArgumentParser:
     # Subcommands
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 
-    # List command
+    if command is not None:
+        _SUBCOMMAND_BUILDERS[command](subparsers)
+    else:
+        for build_subparser in _SUBCOMMAND_BUILDERS.values():
+            build_subparser(subparsers)
+
+    return parser
+
+
+# Top-level options that take a value, which must be skipped when looking for the subcommand
+_OPTIONS_WITH_VALUE: Final = frozenset({"--file", "-f", "--directory", "-d"})
+
+
+def _peek_command(argv: Sequence[str]) -> str | None:
+    """Find the subcommand name in the arguments without fully parsing them."""
+    args = iter(argv)
+    for arg in args:
+        if arg in ("-h", "--help"):
+            return None
+        if arg in _OPTIONS_WITH_VALUE:
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def _add_list_parser(subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]") -> None:
+    """Add the 'list' subcommand parser."""
     list_parser = subparsers.add_parser("list", help="List all presets with optional filtering")
     list_parser.add_argument(
         "--type",
@@ -42,7 +92,9 @@ def create_parser() -> argparse.ArgumentParser:
     list_parser.add_argument("--show-hidden", action="store_true", help="Show hidden presets")
     list_parser.add_argument("--flat", action="store_true", help="Show flat list without relationships")
 
-    # Show command
+
+def _add_show_parser(subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]") -> None:
+    """Add the 'show' subcommand parser."""
     show_parser = subparsers.add_parser("show", help="Show details of a specific preset")
     show_parser.add_argument("preset_name", help="Name of the preset to display")
     show_parser.add_argument("--type", "-t", choices=PRESET_TYPES, help="Type of preset (optional if name is unique)")
@@ -50,29 +102,39 @@ def create_parser() -> argparse.ArgumentParser:
     show_parser.add_argument("--flatten", action="store_true", help="Show flattened preset with all inherited values resolved")
     show_parser.add_argument("--resolve", action="store_true", help="Tries to resolve all macros to their actual values")
 
-    # Related command
+
+def _add_related_parser(subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]") -> None:
+    """Add the 'related' subcommand parser."""
     related_parser = subparsers.add_parser("related", help="Show presets related to a specific configure preset")
     related_parser.add_argument("configure_preset", help="Name of the configure preset")
     related_parser.add_argument("--type", "-t", choices=[BUILD, TEST, PACKAGE], default="all", help="Type of related presets to show (default: all)")
     related_parser.add_argument("--show-hidden", action="store_true", help="Show hidden presets")
     related_parser.add_argument("--plain", "-p", action="store_true", help="Output in a simple format suitable for parsing in scripts")
 
-    return parser
+
+_SUBCOMMAND_BUILDERS: Final[dict[str, Callable[["argparse._SubParsersAction[argparse.ArgumentParser]"], None]]] = {
+    "list": _add_list_parser,
+    "show": _add_show_parser,
+    "related": _add_related_parser,
+}
+
+
+# CMakePresets property holding the presets of each preset type
+_PRESET_TYPE_ATTRS: Final = {
+    CONFIGURE: "configure_presets",
+    BUILD: "build_presets",
+    TEST: "test_presets",
+    PACKAGE: "package_presets",
+    WORKFLOW: "workflow_presets",
+}
 
 
 def get_presets_by_type(presets: CMakePresets, preset_type: str) -> list[dict[str, Any]]:
     """Get presets of a specific type."""
-    if preset_type == CONFIGURE:
-        return presets.configure_presets
-    elif preset_type == BUILD:
-        return presets.build_presets
-    elif preset_type == TEST:
-        return presets.test_presets
-    elif preset_type == PACKAGE:
-        return presets.package_presets
-    elif preset_type == WORKFLOW:
-        return presets.workflow_presets
-    return []
+    attr = _PRESET_TYPE_ATTRS.get(preset_type)
+    if attr is None:
+        return []
+    return cast(list[dict[str, Any]], getattr(presets, attr))
 
 
 def handle_list_command(presets: CMakePresets, args: argparse.Namespace) -> int:
@@ -87,7 +149,7 @@ def _display_flat_preset_list(presets: CMakePresets, args: argparse.Namespace) -
     """Display a flat list of presets."""
     preset_types = [args.type] if args.type != "all" else PRESET_TYPES
 
-    console.print("[bold]CMake Presets:[/bold]")
+    lines = ["[bold]CMake Presets:[/bold]"]
     found_presets = False
 
     for preset_type in preset_types:
@@ -96,34 +158,40 @@ def _display_flat_preset_list(presets: CMakePresets, args: argparse.Namespace) -
         if not preset_list:
             continue
 
-        # Filter presets
-        filtered_presets = _filter_presets(preset_list, args.show_hidden)
+        # Format the visible presets in a single pass
+        item_lines = [line for preset in _iter_visible(preset_list, args.show_hidden) for line in _format_preset_item(preset)]
 
-        if filtered_presets:
+        if item_lines:
             found_presets = True
-            console.print(f"\n[bold]{preset_type.capitalize()} Presets:[/bold]")
-            for preset in filtered_presets:
-                _print_preset_item(preset)
+            lines.append(f"\n[bold]{preset_type.capitalize()} Presets:[/bold]")
+            lines.extend(item_lines)
 
     if not found_presets:
-        console.print("[yellow]No presets found matching your criteria[/yellow]")
+        lines.append("[yellow]No presets found matching your criteria[/yellow]")
 
+    # Emit everything in a single print so Rich parses markup and writes to the terminal once
+    console.print("\n".join(lines))
     return 0
 
 
 def _filter_presets(preset_list: list[dict[str, Any]], show_hidden: bool) -> list[dict[str, Any]]:
     """Filter presets based on visibility."""
-    filtered = []
+    return list(_iter_visible(preset_list, show_hidden))
+
+
+def _iter_visible(preset_list: Iterable[dict[str, Any]], show_hidden: bool) -> Iterator[dict[str, Any]]:
+    """Yield the presets that should be shown, skipping hidden ones unless requested."""
+    if show_hidden:
+        yield from preset_list
+        return
+
     for preset in preset_list:
-        # Skip hidden presets if not requested
-        if not show_hidden and preset.get("hidden", False):
-            continue
-        filtered.append(preset)
-    return filtered
+        if not preset.get("hidden", False):
+            yield preset
 
 
-def _print_preset_item(preset: dict[str, Any]) -> None:
-    """Print a single preset item in the flat list."""
+def _format_preset_item(preset: dict[str, Any]) -> list[str]:
+    """Format a single preset item in the flat list as output lines."""
     name = preset.get("name", "Unnamed")
     description = preset.get("description", "")
 
@@ -138,10 +206,11 @@ def _print_preset_item(preset: dict[str, Any]) -> None:
     name_style = "dim" if preset.get("hidden", False) else ""
     name_display = f"[{name_style}]{name}[/{name_style}]" if name_style else name
 
-    console.print(f"  • [bold cyan]{name_display}[/bold cyan]{marker_str}")
+    lines = [f"  • [bold cyan]{name_display}[/bold cyan]{marker_str}"]
 
     if description:
-        console.print(f"    {description}")
+        lines.append(f"    {description}")
+    return lines
 
 
 def _display_tabular_preset_list(presets: CMakePresets, args: argparse.Namespace) -> int:
@@ -152,6 +221,10 @@ def _display_tabular_preset_list(presets: CMakePresets, args: argparse.Namespace
         console.print("[yellow]No presets found[/yellow]")
         return 0
 
+    # Rich tables are costly to lay out and pointless when piped, so emit plain rows instead
+    if not console.is_terminal:
+        return _display_plain_preset_list(preset_tree, args.show_hidden)
+
     # Create a table with headers for each preset type
     table = _create_presets_table()
 
@@ -181,8 +254,27 @@ def _display_tabular_preset_list(presets: CMakePresets, args: argparse.Namespace
     return 0
 
 
-def _create_presets_table() -> Table:
+def _display_plain_preset_list(preset_tree: dict[str, Any], show_hidden: bool) -> int:
+    """Display presets as tab-separated lines of configure, build and test preset names."""
+    lines = ["\t".join((CONFIGURE, BUILD, TEST))]
+    for name in sorted(preset_tree.keys()):
+        data = preset_tree[name]
+        if not show_hidden and data["preset"].get("hidden", False):
+            continue
+
+        dependents = data["dependents"]
+        build_names = ",".join(p.get("name", "") for p in dependents.get(BUILD_KEY, []))
+        test_names = ",".join(p.get("name", "") for p in dependents.get(TEST_KEY, []))
+        lines.append("\t".join((name, build_names, test_names)))
+
+    console.out("\n".join(lines), highlight=False)
+    return 0
+
+
+def _create_presets_table() -> "Table":
     """Create the table for displaying presets."""
+    from rich.table import Table
+
     table = Table(title="CMake Presets")
     table.add_column(CONFIGURE, style="cyan", justify="left")
     table.add_column("Build", style="blue", justify="left")
@@ -190,16 +282,16 @@ def _create_presets_table() -> Table:
     return table
 
 
-def _add_separator_row(table: Table) -> None:
+def _add_separator_row(table: "Table") -> None:
     """Add a separator row to the table."""
     separator = "─" * 40
     table.add_row(f"[dim]{separator}[/dim]", f"[dim]{separator}[/dim]", f"[dim]{separator}[/dim]")
 
 
-def _add_preset_group_to_table(table: Table, name: str, config_preset: dict[str, Any], dependents: dict[str, list[dict[str, Any]]]) -> None:
+def _add_preset_group_to_table(table: "Table", name: str, config_preset: dict[str, Any], dependents: dict[str, list[dict[str, Any]]]) -> None:
     """Add a preset group (configure preset and its dependents) to the table."""
-    build_presets = dependents.get(PRESET_MAP[BUILD], [])
-    test_presets = dependents.get(PRESET_MAP[TEST], [])
+    build_presets = dependents.get(BUILD_KEY, [])
+    test_presets = dependents.get(TEST_KEY, [])
 
     # Format configure preset name with build/test counts
     config_display = _format_configure_preset_display(name, config_preset, build_presets, test_presets)
@@ -286,7 +378,8 @@ def handle_show_command(presets: CMakePresets, args: argparse.Namespace) -> int:
 
     # Output as JSON if requested
     if args.json:
-        console.print(json.dumps(found_preset, indent=2))
+        # Print verbatim: no markup parsing, no highlighting and no wrapping of long lines
+        console.print(json.dumps(found_preset, indent=2), markup=False, highlight=False, soft_wrap=True)
         return 0
 
     console.print(f"[bold]Preset: [bold cyan]{preset_name}[/bold cyan] ({found_type})[/bold]\n")
@@ -338,6 +431,8 @@ def _show_inheritance_info(presets: CMakePresets, found_preset: dict[str, Any],
         console.print("[bold]Inheritance tree:[/bold]")
 
         # Create a root tree with the current preset
+        from rich.tree import Tree
+
         tree = Tree(f"[bold cyan]{preset_name}[/bold cyan]", guide_style="dim")
 
         # Build the inheritance tree for each direct parent
@@ -359,7 +454,7 @@ def _show_inheritance_info(presets: CMakePresets, found_preset: dict[str, Any],
             _map_all_properties(preset, preset_name, property_sources)
 
 
-def _build_inheritance_tree(presets: CMakePresets, preset_type: str, preset_name: str, parent_tree: Tree) -> None:
+def _build_inheritance_tree(presets: CMakePresets, preset_type: str, preset_name: str, parent_tree: "Tree") -> None:
     """
     Recursively build the inheritance tree visualization for a preset.
 
@@ -396,6 +491,8 @@ def _show_preset_details(
     is_flattened: bool,
 ) -> None:
     """Show detailed information about a preset."""
+    from rich.table import Table
+
     table = Table(show_header=False, padding=(0, 1), box=None)
     table.add_column("Property", style="bold")
     table.add_column("Value")
@@ -458,7 +555,7 @@ def _map_list_properties(value: list[Any], preset_name: str, property_sources: d
                     _map_all_properties({item_key: item_value}, preset_name, property_sources, f"{item_path}.")
 
 
-def _add_properties_to_table(table: Table, preset: dict[str, Any], property_sources: dict[str, str], prefix: str = "", indent_level: int = 0) -> None:
+def _add_properties_to_table(table: "Table", preset: dict[str, Any], property_sources: dict[str, str], prefix: str = "", indent_level: int = 0) -> None:
     """
     Add properties to the display table, with sources if available.
     """
@@ -495,14 +592,14 @@ def _get_property_source(property_sources: dict[str, str], property_path: str, p
     return source
 
 
-def _add_bool_property(table: Table, key: str, value: bool, source: str, indent: str) -> None:
+def _add_bool_property(table: "Table", key: str, value: bool, source: str, indent: str) -> None:
     """Add a boolean property to the table."""
     value_str = f"{indent}[green]True[/green]" if value else f"{indent}[red]False[/red]"
     table.add_row(f"{indent}{key}", value_str, source)
 
 
 def _add_dict_property(
-    table: Table,
+    table: "Table",
     key: str,
     value: dict[str, Any],
     property_sources: dict[str, str],
@@ -518,7 +615,7 @@ def _add_dict_property(
 
 
 def _add_list_property(
-    table: Table,
+    table: "Table",
     key: str,
     value: list[Any],
     property_sources: dict[str, str],
@@ -540,7 +637,7 @@ def _add_list_property(
 
 
 def _add_complex_list_property(
-    table: Table,
+    table: "Table",
     key: str,
     value: list[Any],
     property_sources: dict[str, str],
@@ -561,7 +658,7 @@ def _add_complex_list_property(
     table.add_row("", f"{indent}]", "")
 
 
-def _add_simple_property(table: Table, key: str, value: Any, source: str, indent: str) -> None:
+def _add_simple_property(table: "Table", key: str, value: Any, source: str, indent: str) -> None:
     """Add a simple property to the table."""
     value_str = f"{indent}{value}"
     table.add_row(f"{indent}{key}", value_str, source)
@@ -606,7 +703,7 @@ def _print_rich_related_output(
     show_hidden: bool,
 ) -> bool:
     """Print rich formatted output for related presets. Returns True if any presets were found."""
-    console.print(f"Presets related to configurePreset: [bold green]{configure_preset_name}[/bold green]")
+    lines = [f"Presets related to configurePreset: [bold green]{configure_preset_name}[/bold green]"]
 
     found_any = False
     for preset_type in preset_types:
@@ -619,11 +716,12 @@ def _print_rich_related_output(
             found_any = True
             preset_names = [p.get("name", "Unnamed") for p in filtered_presets]
             plural = "s" if len(preset_names) > 1 else ""
-            console.print(f"{preset_type}Preset{plural}: [green]{', '.join(preset_names)}[/green]")
+            lines.append(f"{preset_type}Preset{plural}: [green]{', '.join(preset_names)}[/green]")
         else:
             # Only show empty types if explicitly requested
-            console.print(f"{preset_type}Preset: [dim]none[/dim]")
+            lines.append(f"{preset_type}Preset: [dim]none[/dim]")
 
+    console.print("\n".join(lines))
     return found_any
 
 
@@ -703,10 +801,18 @@ def handle_related_command(presets: CMakePresets, args: argparse.Namespace) -> i
     return 0
 
 
-def main() -> int:
-    """Main entry point for the CLI application."""
-    parser = create_parser()
-    args = parser.parse_args()
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Main entry point for the CLI application.
+
+    Args:
+        argv: Command-line arguments to use instead of sys.argv[1:]
+
+    Returns:
+        The process exit code
+    """
+    parser = create_parser(argv)
+    args = parser.parse_args(argv)
 
     # Set up logging based on verbosity
     if args.verbose >= 3:
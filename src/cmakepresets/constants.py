@@ -8,10 +8,16 @@ WORKFLOW: Final = "workflow"
 
 PRESET_TYPES = [CONFIGURE, BUILD, TEST, PACKAGE, WORKFLOW]
 
+CONFIGURE_KEY: Final = "configurePresets"
+BUILD_KEY: Final = "buildPresets"
+TEST_KEY: Final = "testPresets"
+PACKAGE_KEY: Final = "packagePresets"
+WORKFLOW_KEY: Final = "workflowPresets"
+
 PRESET_MAP: Final = {
-    CONFIGURE: "configurePresets",
-    BUILD: "buildPresets",
-    TEST: "testPresets",
-    PACKAGE: "packagePresets",
-    WORKFLOW: "workflowPresets",
+    CONFIGURE: CONFIGURE_KEY,
+    BUILD: BUILD_KEY,
+    TEST: TEST_KEY,
+    PACKAGE: PACKAGE_KEY,
+    WORKFLOW: WORKFLOW_KEY,
 }
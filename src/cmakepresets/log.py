@@ -1,7 +1,8 @@
+import functools
+import importlib.util
 import logging
 from typing import Any, Final
 
-import jsonschema
 from rich.console import Console
 from rich.logging import RichHandler
 
@@ -15,6 +16,20 @@ DEBUG: Final = logging.DEBUG
 NOTSET: Final = logging.NOTSET
 
 
+def _get_package_paths(name: str) -> list[str]:
+    """Locate the directories of an installed package without importing it."""
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.submodule_search_locations is None:
+        return []
+    return list(spec.submodule_search_locations)
+
+
+@functools.cache
+def _get_console(colors: bool) -> Console:
+    """Get the console shared by all loggers with the same color setting."""
+    return Console(color_system="auto" if colors else None)
+
+
 class Logger(logging.Logger):
     """
     Configure rich-based logging for the application.
@@ -29,9 +44,9 @@ class Logger(logging.Logger):
 
         self.parent = logging.root
 
-        self.console = Console(color_system="auto" if colors else None)
+        self.console = _get_console(colors)
 
-        handler = RichHandler(console=self.console, rich_tracebacks=True, tracebacks_suppress=[jsonschema])
+        handler = RichHandler(console=self.console, rich_tracebacks=True, tracebacks_suppress=_get_package_paths("jsonschema"))
         formatter = logging.Formatter("[%(name)s]   %(message)s")
         handler.setFormatter(formatter)
 
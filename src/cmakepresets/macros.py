@@ -1,16 +1,23 @@
 import copy
+import functools
 import os
 import platform
 import re
 from collections.abc import Mapping
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, Final, cast
 
 from . import logger as mainLogger
 from .paths import CMakeRoot
 
 logger = mainLogger.getChild(__name__)
 
+# ${name}, $env{name}, $penv{name} and $vendor{name}; names never contain '$'
+# so that a macro nested inside another one is substituted first
+_MACRO_RE: Final = re.compile(r"\$(env|penv|vendor)?\{([^$}]+)\}")
+_VENDOR_MACRO_RE: Final = re.compile(r"\$vendor\{([^}]+)\}")
+_PENDING_MACRO_RE: Final = re.compile(r"\$(?:env|penv)?\{")
+
 
 class MacroResolver:
     """Class for resolving macros in CMake preset values."""
@@ -20,12 +27,26 @@ class MacroResolver:
         Initialize the macro resolver.
 
         Args:
-            root: CMakeRoot instance containing source directory and presets file paths
+            root: CMakeRoot instance containing source directory and presets file paths.
+                  Defaults to the current directory, looked up only when a preset is resolved.
         """
-        if root is None:
-            root = CMakeRoot(Path.cwd())
-        self.source_dir = root.source_dir
-        self.presets_file_path = root.presets_file
+        if root is not None:
+            self.root = root
+
+    @functools.cached_property
+    def root(self) -> CMakeRoot:
+        """Project root of the current directory, for resolvers created without one."""
+        return CMakeRoot(Path.cwd())
+
+    @property
+    def source_dir(self) -> Path:
+        """Source directory that ${sourceDir} and related macros expand to."""
+        return self.root.source_dir
+
+    @property
+    def presets_file_path(self) -> Path | None:
+        """Presets file used for ${fileDir} when a preset's own file is unknown."""
+        return self.root.presets_file
 
     def resolve_in_preset(
         self,
@@ -149,17 +170,21 @@ class MacroResolver:
 
     def _create_basic_context(self, preset: dict[str, Any]) -> dict[str, Any]:
         """Create basic context with standard macros."""
-        source_dir = self.source_dir
-        source_parent_dir = self.source_dir.parent
+        context = dict(self._static_context)
+        context["presetName"] = preset.get("name", "")
+        return context
 
+    @functools.cached_property
+    def _static_context(self) -> dict[str, Any]:
+        """Standard macros that are the same for every preset, computed once per resolver."""
+        host_system_name = platform.system()
         return {
-            "sourceDir": source_dir,
-            "sourceParentDir": source_parent_dir,
+            "sourceDir": self.source_dir,
+            "sourceParentDir": self.source_dir.parent,
             "sourceDirName": self.source_dir.name,
-            "presetName": preset.get("name", ""),
-            "hostSystemName": platform.system(),
+            "hostSystemName": host_system_name,
             "dollar": "$",
-            "pathListSep": ":" if platform.system() != "Windows" else ";",
+            "pathListSep": ":" if host_system_name != "Windows" else ";",
         }
 
     def _get_environment_context(
@@ -204,15 +229,20 @@ class MacroResolver:
         return value
 
     def _replace_macro(self, match: re.Match[str], context: dict[str, Any]) -> str:
-        macro_name: str = match.group(1)
+        namespace = match.group(1)
+        if namespace == "env":
+            return self._replace_env(match, context)
+        if namespace == "penv":
+            return self._replace_penv(match, context)
+        if namespace == "vendor":
+            return match.group(0)  # Vendor macros cannot be resolved
+        macro_name: str = match.group(2)
         context_value = context.get(macro_name, match.group(0))
         # Convert Path objects to strings for substitution
-        if isinstance(context_value, Path):
-            return str(context_value)
         return str(context_value)
 
     def _replace_env(self, match: re.Match[str], context: dict[str, Any]) -> str:
-        env_name: str = match.group(1)
+        env_name: str = match.group(2)
         env_dict = context.get("env", {})
         if env_name in env_dict:
             return str(env_dict[env_name])
@@ -220,7 +250,7 @@ class MacroResolver:
             return match.group(0)  # Return the original macro if not found
 
     def _replace_penv(self, match: re.Match[str], context: dict[str, Any]) -> str:
-        env_name: str = match.group(1)
+        env_name: str = match.group(2)
         penv_dict = context.get("penv", {})
         if env_name in penv_dict:
             return str(penv_dict[env_name])
@@ -243,27 +273,27 @@ class MacroResolver:
             logger.warning(f"Maximum macro resolution depth reached for: {value}")
             return value
 
-        # Replace macro references
-        result = re.sub(r"\${([^}]+)}", lambda m: self._replace_macro(m, context), value)
+        # Every macro starts with '$', so most values can skip the regex entirely
+        has_macros = "$" in value
 
-        # Replace environment variable references
-        result = re.sub(r"\$env{([^}]+)}", lambda m: self._replace_env(m, context), result)
-        result = re.sub(r"\$penv{([^}]+)}", lambda m: self._replace_penv(m, context), result)
+        # Replace macro and environment variable references in a single pass
+        substituted = _MACRO_RE.sub(lambda m: self._replace_macro(m, context), value) if has_macros else value
 
         # Normalize paths
-        result = self._normalize_path(result)
+        result = self._normalize_path(substituted)
 
         # Remove "./" prefix from paths
         if result.startswith("./") and not result.startswith("$"):
             result = result[2:]
 
         # Check for vendor macros
-        if re.search(r"\$vendor{([^}]+)}", result):
-            vendor_macros = re.findall(r"\$vendor{([^}]+)}", result)
+        vendor_macros = _VENDOR_MACRO_RE.findall(result) if has_macros else None
+        if vendor_macros:
             logger.warning(f"String contains vendor macros which cannot be resolved: {vendor_macros}")
 
-        # If there are still macros to resolve, call recursively
-        if re.search(r"\${|\$env{|\$penv{", result):
+        # Substituted values may contain macros of their own; once a pass
+        # changes nothing, whatever is left cannot be resolved
+        if substituted != value and _PENDING_MACRO_RE.search(result):
             return self.resolve_string(result, context, depth + 1)
 
         return result
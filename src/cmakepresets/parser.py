@@ -1,4 +1,6 @@
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Final, cast
 
@@ -6,10 +8,13 @@ from . import logger as mainLogger
 from . import utils
 from .exceptions import FileParseError, FileReadError, VersionError
 from .paths import CMakeRoot
-from .schema import check_cmake_version_for_schema, get_schema, validate_json_against_schema
+from .schema import check_cmake_version_for_schema, validate_json_against_schema
 
 logger: Final = mainLogger.getChild(__name__)
 
+# Upper bound on threads reading sibling includes at the same time
+_MAX_READ_WORKERS: Final = 8
+
 
 class Parser:
     """Parser for CMakePresets.json and related files."""
@@ -50,10 +55,8 @@ class Parser:
         main_rel = cast(Path, self.root.presets_file).name
         schema_version = self._validate_version_requirements(main_rel, self.loaded_files[main_rel])
 
-        logger.debug(f"Getting schema for version {schema_version}")
-        schema = get_schema(schema_version)
         logger.debug(f"Validating main file against schema version {schema_version}")
-        validate_json_against_schema(self.loaded_files[main_rel], schema)
+        validate_json_against_schema(self.loaded_files[main_rel])
         check_cmake_version_for_schema(schema_version, self.loaded_files[main_rel].get("cmakeMinimumRequired", {}))
 
         # Load user presets if present
@@ -77,15 +80,44 @@ class Parser:
             FileReadError: If the file cannot be read
             FileParseError: If the file cannot be parsed as JSON
         """
+        self._store_file(filepath, self._read_file(filepath))
+
+    def _read_file(self, filepath: Path) -> bytes:
+        """
+        Read the raw contents of a presets file.
+
+        Args:
+            filepath: Path to the JSON file
+
+        Returns:
+            The undecoded file contents
+
+        Raises:
+            FileReadError: If the file cannot be read
+        """
         logger.debug(f"Loading file: {filepath}")
         try:
-            content = utils.read_file_text(filepath)
+            return utils.read_file_bytes(filepath)
         except OSError as e:
             logger.error(f"Failed to read file: {filepath}, error: {e}")
             raise FileReadError(f"Unable to read '{filepath.name}': {e}") from e
 
+    def _store_file(self, filepath: Path, content: bytes) -> None:
+        """
+        Parse file contents as JSON and store them under the file's relative path.
+
+        Args:
+            filepath: Path the contents were read from
+            content: Raw file contents; json detects the encoding and skips a UTF-8 BOM
+
+        Raises:
+            FileParseError: If the contents cannot be decoded or parsed as JSON
+        """
         try:
             json_data = json.loads(content)
+        except UnicodeDecodeError as e:
+            logger.error(f"Failed to decode file: {filepath}, error: {e}")
+            raise FileParseError(f"Unable to decode '{filepath.name}' at byte {e.start}: {e.reason}") from e
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON in file: {filepath}, error: {e}")
             line = e.lineno
@@ -102,6 +134,33 @@ class Parser:
         self.loaded_files[relative_path] = json_data
         logger.info(f"Successfully loaded file: {filepath}")
 
+    def _load_files(self, filepaths: list[Path]) -> None:
+        """
+        Load several JSON files, reading them concurrently.
+
+        Files are read in parallel so disk I/O for sibling includes overlaps,
+        then parsed and stored in the given order to keep results deterministic.
+
+        Args:
+            filepaths: Paths to the JSON files
+
+        Raises:
+            FileReadError: If a file cannot be read
+            FileParseError: If a file cannot be parsed as JSON
+        """
+        if not filepaths:
+            return
+
+        # A single file has nothing to overlap with, so skip starting worker threads
+        if len(filepaths) == 1:
+            contents = [self._read_file(filepaths[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(_MAX_READ_WORKERS, len(filepaths))) as executor:
+                contents = list(executor.map(self._read_file, filepaths))
+
+        for filepath, content in zip(filepaths, contents, strict=True):
+            self._store_file(filepath, content)
+
     def _validate_version_requirements(self, file_path: str, data: dict[str, Any]) -> int:
         """
         Validate version and cmakeMinimumRequired fields in a CMakePresets file.
@@ -133,11 +192,11 @@ class Parser:
         """
         Process all includes in loaded files recursively.
         """
-        files_to_process = list(self.loaded_files.keys())
+        files_to_process = deque(self.loaded_files)
         logger.debug(f"Starting to process includes for {len(files_to_process)} files")
 
         while files_to_process:
-            current_file = files_to_process.pop(0)
+            current_file = files_to_process.popleft()
 
             if current_file in self.processed_files:
                 logger.debug(f"Skipping already processed file: {current_file}")
@@ -151,6 +210,7 @@ class Parser:
             # Process includes if present
             if "include" in current_data and isinstance(current_data["include"], list):
                 logger.debug(f"Found {len(current_data['include'])} includes in {current_file}")
+                pending: dict[str, Path] = {}
                 for include_path in current_data["include"]:
                     # If include path is relative, resolve it relative to current_dir and then self.root.source_dir
                     include_abs = (self.root.source_dir / current_dir / include_path).resolve()
@@ -161,13 +221,15 @@ class Parser:
                         include_rel = str(include_abs)
                         logger.debug(f"Include path {include_path} resolved to outside root_dir: {include_rel}")
 
-                    # Load the file if not already loaded
-                    if include_rel not in self.loaded_files:
+                    # Queue the file if not already loaded
+                    if include_rel not in self.loaded_files and include_rel not in pending:
                         logger.info(f"Including file: {include_rel}")
-                        self._load_file(include_abs)
-                        files_to_process.append(include_rel)
+                        pending[include_rel] = include_abs
                     else:
                         logger.debug(f"Include file already loaded: {include_rel}")
+
+                self._load_files(list(pending.values()))
+                files_to_process.extend(pending)
             else:
                 logger.debug(f"No includes found in {current_file}")
 
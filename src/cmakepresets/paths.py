@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from . import logger as mainLogger
@@ -35,6 +36,9 @@ class CMakeRoot:
             self._presets_file = path / "CMakePresets.json"
             logger.debug(f"Using directory path: {self._source_dir}")
 
+        # Prefix of every path below the source directory, for get_relative_path
+        self._source_prefix = os.path.normcase(os.path.join(self._source_dir, ""))
+
         if self._presets_file.exists():
             self._has_presets = True
             logger.debug(f"Found presets file: {self._presets_file}")
@@ -83,12 +87,11 @@ class CMakeRoot:
 
     def get_relative_path(self, path: Path) -> str:
         """Return path relative to source directory if possible, otherwise absolute path."""
-        try:
-            relative = path.relative_to(self._source_dir)
-            # Handle the case where path equals source_dir, which would return '.'
-            if str(relative) == ".":
-                if path.is_file():
-                    return path.name
-            return str(relative)
-        except ValueError:
-            return str(path)
+        path_str = str(path)
+        # Compare as strings: Path.relative_to builds intermediate paths and raises for unrelated ones
+        if os.path.normcase(path_str).startswith(self._source_prefix):
+            return path_str[len(self._source_prefix) :]
+        # Handle the case where path equals source_dir, which relative_to would return as '.'
+        if path == self._source_dir:
+            return path.name if path.is_file() else "."
+        return path_str
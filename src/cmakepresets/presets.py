@@ -1,15 +1,22 @@
-from collections.abc import Iterator
+import functools
+import sys
+from collections.abc import Collection, Iterator, Mapping
 from pathlib import Path
-from typing import Any, Final, cast
+from types import MappingProxyType
+from typing import Any, Final
 
+from . import log
 from . import logger as mainLogger
-from .constants import BUILD, CONFIGURE, PACKAGE, PRESET_MAP, TEST, WORKFLOW
-from .macros import resolve_macros_in_preset
+from .constants import BUILD, BUILD_KEY, CONFIGURE, CONFIGURE_KEY, PACKAGE, PACKAGE_KEY, PRESET_MAP, TEST, TEST_KEY, WORKFLOW, WORKFLOW_KEY
+from .macros import MacroResolver
 from .parser import Parser
 from .paths import CMakeRoot
 
 logger: Final = mainLogger.getChild(__name__)
 
+_INHERITS_ONLY: Final = frozenset({"inherits"})
+_NON_INHERITABLE: Final = frozenset({"inherits", "hidden"})
+
 
 class CMakePresets:
     """Class for working with CMake presets data."""
@@ -39,35 +46,126 @@ class CMakePresets:
         self.parser.parse_file(str(self.root.presets_file))
         logger.debug(f"Successfully parsed {len(self.parser.loaded_files)} preset files")
 
-        # Log number of presets found
-        for preset_type, key in PRESET_MAP.items():
-            count = sum(1 for _ in self._iter_presets_of_type(key))
-            logger.debug(f"Found {count} {preset_type} presets")
+        self._index_presets()
+        self._flattened_presets: dict[tuple[str, str], dict[str, Any]] = {}
+        self._inheritance_chains: dict[tuple[str, str], list[dict[str, Any]]] = {}
+
+        # Log number of presets found, skipping the scan when nobody would see it
+        if logger.isEnabledFor(log.DEBUG):
+            for preset_type, key in PRESET_MAP.items():
+                count = sum(1 for _ in self._iter_presets_of_type(key))
+                logger.debug(f"Found {count} {preset_type} presets")
+
+    def _index_presets(self) -> None:
+        """
+        Walk all loaded presets once, interning their name references and
+        recording which file each preset was defined in.
+
+        Interning makes the name comparisons done by the lookup methods
+        resolve on identity in the common case.
+        """
+        self._file_paths: dict[str, str] = {}
+        for filepath, file_data in self.parser.loaded_files.items():
+            for preset_key in PRESET_MAP.values():
+                for preset in file_data.get(preset_key, ()):
+                    for field in ("name", "configurePreset"):
+                        value = preset.get(field)
+                        if isinstance(value, str):
+                            preset[field] = sys.intern(value)
+                    inherits = preset.get("inherits")
+                    if isinstance(inherits, str):
+                        preset["inherits"] = sys.intern(inherits)
+                    elif isinstance(inherits, list):
+                        preset["inherits"] = [sys.intern(parent) if isinstance(parent, str) else parent for parent in inherits]
+                    name = preset.get("name")
+                    if name:
+                        self._file_paths[name] = filepath
+
+    @functools.cached_property
+    def _preset_index(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """
+        Index of all presets by preset type, then by preset name.
+
+        Built on first use; when a name occurs more than once for a type, the
+        first definition in load order wins, matching a linear scan.
+        """
+        index: dict[str, dict[str, dict[str, Any]]] = {}
+        for preset_type, preset_key in PRESET_MAP.items():
+            by_name = index[preset_type] = {}
+            for preset in self._iter_presets_of_type(preset_key):
+                name = preset.get("name")
+                if isinstance(name, str):
+                    by_name.setdefault(name, preset)
+        return index
 
     @property
     def configure_presets(self) -> list[dict[str, Any]]:
         """Get all configure presets across all loaded files."""
-        return list(self._iter_presets_of_type(PRESET_MAP[CONFIGURE]))
+        return list(self._presets_by_type[CONFIGURE_KEY])
 
     @property
     def build_presets(self) -> list[dict[str, Any]]:
         """Get all build presets across all loaded files."""
-        return list(self._iter_presets_of_type(PRESET_MAP[BUILD]))
+        return list(self._presets_by_type[BUILD_KEY])
 
     @property
     def test_presets(self) -> list[dict[str, Any]]:
         """Get all test presets across all loaded files."""
-        return list(self._iter_presets_of_type(PRESET_MAP[TEST]))
+        return list(self._presets_by_type[TEST_KEY])
 
     @property
     def package_presets(self) -> list[dict[str, Any]]:
         """Get all package presets across all loaded files."""
-        return list(self._iter_presets_of_type(PRESET_MAP[PACKAGE]))
+        return list(self._presets_by_type[PACKAGE_KEY])
 
     @property
     def workflow_presets(self) -> list[dict[str, Any]]:
         """Get all workflow presets across all loaded files."""
-        return list(self._iter_presets_of_type(PRESET_MAP[WORKFLOW]))
+        return list(self._presets_by_type[WORKFLOW_KEY])
+
+    @property
+    def configure_preset_names(self) -> frozenset[str]:
+        """Get the names of all configure presets, for membership tests."""
+        return self._preset_names[CONFIGURE]
+
+    @property
+    def build_preset_names(self) -> frozenset[str]:
+        """Get the names of all build presets, for membership tests."""
+        return self._preset_names[BUILD]
+
+    @property
+    def test_preset_names(self) -> frozenset[str]:
+        """Get the names of all test presets, for membership tests."""
+        return self._preset_names[TEST]
+
+    @property
+    def package_preset_names(self) -> frozenset[str]:
+        """Get the names of all package presets, for membership tests."""
+        return self._preset_names[PACKAGE]
+
+    @property
+    def workflow_preset_names(self) -> frozenset[str]:
+        """Get the names of all workflow presets, for membership tests."""
+        return self._preset_names[WORKFLOW]
+
+    @functools.cached_property
+    def _preset_names(self) -> dict[str, frozenset[str]]:
+        """Names of all presets by preset type, taken from the name index."""
+        return {preset_type: frozenset(by_name) for preset_type, by_name in self._preset_index.items()}
+
+    @functools.cached_property
+    def _presets_by_type(self) -> dict[str, list[dict[str, Any]]]:
+        """
+        All presets of each type across all loaded files, in load order.
+
+        Collected once on first use; the public properties hand out copies so
+        callers cannot change what later lookups see.
+        """
+        presets_by_type: dict[str, list[dict[str, Any]]] = {preset_key: [] for preset_key in PRESET_MAP.values()}
+        for file_data in self.parser.loaded_files.values():
+            for preset_key, presets in presets_by_type.items():
+                presets.extend(file_data.get(preset_key, ()))
+        return presets_by_type
 
     def _iter_presets_of_type(self, preset_type: str) -> Iterator[dict[str, Any]]:
         """
@@ -76,12 +174,10 @@ class CMakePresets:
         Args:
             preset_type: Type of preset (configurePresets, buildPresets, etc.)
 
-        Yields:
-            Each preset of the specified type
+        Returns:
+            An iterator over each preset of the specified type
         """
-        for filepath, file_data in self.parser.loaded_files.items():
-            if preset_type in file_data:
-                yield from file_data[preset_type]
+        return iter(self._presets_by_type.get(preset_type, ()))
 
     def get_configure_presets(self) -> list[dict[str, Any]]:
         """Get all configure presets."""
@@ -115,19 +211,14 @@ class CMakePresets:
             Preset dict if found, None otherwise
         """
         logger.debug(f"Looking for {preset_type} preset with name '{name}'")
-        preset_key = PRESET_MAP[preset_type]
-
-        for filepath, file_data in self.parser.loaded_files.items():
-            if preset_key not in file_data:
-                continue
-
-            for preset in file_data[preset_key]:
-                if preset.get("name") == name:
-                    logger.debug(f"Found preset '{name}' in file {filepath}")
-                    return cast(dict[str, Any], preset)
+        by_name = self._preset_index.get(preset_type)
+        preset = by_name.get(name) if by_name is not None else None
+        if preset is None:
+            logger.debug(f"Preset '{name}' not found")
+            return None
 
-        logger.debug(f"Preset '{name}' not found")
-        return None
+        logger.debug(f"Found preset '{name}'")
+        return preset
 
     def find_preset(self, name: str) -> dict[str, Any] | None:
         """
@@ -139,10 +230,10 @@ class CMakePresets:
         Returns:
             The preset dict if found, None otherwise
         """
-        for preset_type in PRESET_MAP:
-            for preset in self._iter_presets_of_type(PRESET_MAP[preset_type]):
-                if preset.get("name") == name:
-                    return preset
+        for by_name in self._preset_index.values():
+            preset = by_name.get(name)
+            if preset is not None:
+                return preset
 
         return None
 
@@ -154,6 +245,25 @@ class CMakePresets:
             preset_type: Type of preset (configure, build, test, package, workflow)
             preset_name: Name of the preset
 
+        Returns:
+            List of preset dicts in inheritance order (base first, immediate parent last)
+        """
+        key = (preset_type, preset_name)
+        chain = self._inheritance_chains.get(key)
+        if chain is None:
+            chain = self._inheritance_chains[key] = self._collect_inheritance_chain(preset_type, preset_name, set())
+        # Callers may extend the list, so never hand out the memoized one
+        return list(chain)
+
+    def _collect_inheritance_chain(self, preset_type: str, preset_name: str, visiting: set[str]) -> list[dict[str, Any]]:
+        """
+        Recursively collect the inheritance chain for a preset.
+
+        Args:
+            preset_type: Type of preset (configure, build, test, package, workflow)
+            preset_name: Name of the preset
+            visiting: Names of presets currently being resolved, used to detect cycles
+
         Returns:
             List of preset dicts in inheritance order (base first, immediate parent last)
         """
@@ -173,11 +283,16 @@ class CMakePresets:
             return chain
 
         # Process each parent in the inheritance list
+        visiting.add(preset_name)
         for parent_name in inherits_values:
+            # A preset already being resolved is a descendant, never an ancestor to merge
+            if parent_name in visiting:
+                logger.warning(f"Inheritance cycle detected at preset '{parent_name}'")
+                continue
             parent = self.get_preset_by_name(preset_type, parent_name)
             if parent:
                 # Get the parent's inheritance chain first (recursive)
-                parent_chain = self.get_preset_inheritance_chain(preset_type, parent_name)
+                parent_chain = self._collect_inheritance_chain(preset_type, parent_name, visiting)
 
                 # Add the parent's chain and the parent itself
                 # Avoid duplicates in the chain
@@ -189,6 +304,7 @@ class CMakePresets:
                     chain.append(parent)
             else:
                 logger.warning(f"Could not find parent preset '{parent_name}' referenced by '{preset_name}'")
+        visiting.discard(preset_name)
 
         return chain
 
@@ -201,8 +317,29 @@ class CMakePresets:
             preset_name: Name of the preset
 
         Returns:
-            Dict with all inherited properties flattened
+            Dict with all inherited properties flattened. The dict is a fresh copy
+            that the caller is free to modify.
+        """
+        flattened = self._get_flattened_preset(preset_type, preset_name)
+        return {key: value.copy() if isinstance(value, dict) else value for key, value in flattened.items()}
+
+    def _get_flattened_preset(self, preset_type: str, preset_name: str) -> dict[str, Any]:
+        """
+        Get the memoized flattened preset, computing it on first request.
+
+        The returned dict is shared between callers and must not be modified.
+        Missing presets are not memoized so that every lookup still warns.
         """
+        key = (preset_type, preset_name)
+        flattened = self._flattened_presets.get(key)
+        if flattened is None:
+            flattened = self._flatten_uncached(preset_type, preset_name)
+            if flattened:
+                self._flattened_presets[key] = flattened
+        return flattened
+
+    def _flatten_uncached(self, preset_type: str, preset_name: str) -> dict[str, Any]:
+        """Resolve a preset's inheritance chain into a single dict."""
         preset = self.get_preset_by_name(preset_type, preset_name)
         if not preset:
             logger.warning(f"Could not find preset '{preset_name}' of type '{preset_type}'")
@@ -212,25 +349,26 @@ class CMakePresets:
         chain = self.get_preset_inheritance_chain(preset_type, preset_name)
         chain.append(preset)  # Add the preset itself
 
-        return self._merge_presets_chain(chain, non_inheritable_properties=["inherits", "hidden"])
+        return self._merge_presets_chain(chain, non_inheritable_properties=_NON_INHERITABLE)
 
-    def _merge_presets_chain(self, chain: list[dict[str, Any]], non_inheritable_properties: list[str]) -> dict[str, Any]:
+    def _merge_presets_chain(self, chain: list[dict[str, Any]], non_inheritable_properties: Collection[str]) -> dict[str, Any]:
         merged: dict[str, Any] = {}
+        last = chain[-1] if chain else None
+        skipped_keys = frozenset(non_inheritable_properties) | _INHERITS_ONLY
         for p in chain:
-            temp = {}
+            skipped = _INHERITS_ONLY if p is last else skipped_keys
             for key, value in p.items():
-                if key in non_inheritable_properties and p != chain[-1]:
-                    continue
-                if key == "inherits":
+                if key in skipped:
                     continue
                 if isinstance(value, dict):
-                    if key in merged and isinstance(merged[key], dict):
-                        temp[key] = {**merged[key], **value}
+                    # Merged dicts are always our own copies, so update them in place
+                    previous = merged.get(key)
+                    if isinstance(previous, dict):
+                        previous.update(value)
                     else:
-                        temp[key] = value.copy()
+                        merged[key] = value.copy()
                 else:
-                    temp[key] = value
-            merged.update(temp)
+                    merged[key] = value
         return merged
 
     def get_dependent_presets(self, preset_type: str, preset_name: str) -> dict[str, list[dict[str, Any]]]:
@@ -244,28 +382,36 @@ class CMakePresets:
         Returns:
             Dict mapping preset types to lists of dependent presets
         """
-        dependent_presets: dict[str, list[dict[str, Any]]] = {pt: [] for pt in PRESET_MAP.values()}
-
         # Only configure presets can be referenced by other preset types
         if preset_type != CONFIGURE:
-            return dependent_presets
+            return {pt: [] for pt in PRESET_MAP.values()}
+
+        # Callers own the result, so copy the lists out of the shared index
+        dependents = self._dependents_index.get(preset_name, {})
+        return {pt: list(dependents.get(pt, ())) for pt in PRESET_MAP.values()}
+
+    @functools.cached_property
+    def _dependents_index(self) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        """
+        Build/test/package presets grouped by the configure preset they resolve to.
 
-        for dep_type in [BUILD, TEST, PACKAGE]:
-            dep_type_key = PRESET_MAP[dep_type]
-            for preset in getattr(self, f"{dep_type}_presets"):
+        Built on first use with a single pass over the dependent preset types, so
+        each dependency lookup is a dictionary access instead of a full scan.
+        """
+        index: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        for dep_type, dep_type_key in ((BUILD, BUILD_KEY), (TEST, TEST_KEY), (PACKAGE, PACKAGE_KEY)):
+            for preset in self._iter_presets_of_type(dep_type_key):
                 # Direct dependency through configurePreset field
-                if preset.get("configurePreset") == preset_name:
-                    dependent_presets[dep_type_key].append(preset)
-                    continue
+                configure_preset = preset.get("configurePreset")
 
                 # Check for indirect dependency through inheritance
-                if "inherits" in preset and "configurePreset" not in preset:
+                if configure_preset is None and "inherits" in preset:
                     # Get the resolved configurePreset by flattening
-                    flattened = self.flatten_preset(dep_type, preset.get("name", ""))
-                    if flattened.get("configurePreset") == preset_name:
-                        dependent_presets[dep_type_key].append(preset)
+                    configure_preset = self._get_flattened_preset(dep_type, preset.get("name", "")).get("configurePreset")
 
-        return dependent_presets
+                if isinstance(configure_preset, str):
+                    index.setdefault(configure_preset, {}).setdefault(dep_type_key, []).append(preset)
+        return index
 
     def get_preset_tree(self) -> dict[str, Any]:
         """
@@ -273,15 +419,28 @@ class CMakePresets:
         and build/test/package presets that depend on them are children.
 
         Returns:
-            Dict mapping configure preset names to their dependent presets
+            Dict mapping configure preset names to their dependent presets.
+            The tree is built once per instance; callers get their own copy of it.
         """
+        return {
+            name: {"preset": entry["preset"], "dependents": {pt: list(deps) for pt, deps in entry["dependents"].items()}}
+            for name, entry in self._preset_tree.items()
+        }
+
+    @functools.cached_property
+    def _preset_tree(self) -> dict[str, Any]:
+        """Tree of configure presets and their dependents, built on first access."""
+        return self._build_tree()
+
+    def _build_tree(self) -> dict[str, Any]:
+        """Build the configure preset tree returned by get_preset_tree."""
         tree = {}
 
         # Start with all configure presets
         for configure_preset in self.configure_presets:
             name = configure_preset.get("name")
             if name:
-                dependent_presets: dict[str, list[dict[str, Any]]] = self.get_dependent_presets(CONFIGURE, name)
+                dependent_presets = self.get_dependent_presets(CONFIGURE, name)
                 tree[name] = {"preset": configure_preset, "dependents": dependent_presets}
 
         return tree
@@ -297,8 +456,8 @@ class CMakePresets:
         Returns:
             Dictionary of related presets by type or None if preset not found
         """
-        # Get the preset tree (contains relationship data)
-        preset_tree = self.get_preset_tree()
+        # Get the preset tree (contains relationship data); it is shared, so only copies leave this method
+        preset_tree = self._preset_tree
 
         # Check if the configure preset exists
         if configure_preset_name not in preset_tree:
@@ -315,14 +474,14 @@ class CMakePresets:
         if preset_type:
             preset_key = f"{preset_type}Presets"
             if preset_key in dependent_presets:
-                return {preset_type: dependent_presets[preset_key]}
+                return {preset_type: list(dependent_presets[preset_key])}
             return {preset_type: []}
 
         # Return all related presets (build, test, package)
         return {
-            BUILD: dependent_presets.get(PRESET_MAP[BUILD], []),
-            TEST: dependent_presets.get(PRESET_MAP[TEST], []),
-            PACKAGE: dependent_presets.get(PRESET_MAP[PACKAGE], []),
+            BUILD: list(dependent_presets.get(BUILD_KEY, [])),
+            TEST: list(dependent_presets.get(TEST_KEY, [])),
+            PACKAGE: list(dependent_presets.get(PACKAGE_KEY, [])),
         }
 
     def resolve_macro_values(self, preset_type: str, preset_name: str) -> dict[str, Any]:
@@ -336,27 +495,18 @@ class CMakePresets:
         Returns:
             A new preset with all macros resolved
         """
-        flattened = self.flatten_preset(preset_type, preset_name)
+        flattened = self._get_flattened_preset(preset_type, preset_name)
 
         # Get file paths to provide context for macros
         preset_file_paths = self._get_preset_file_paths()
 
-        # Use the updated API
-        return resolve_macros_in_preset(
-            flattened,
-            self.root,
-            file_paths=preset_file_paths,
-        )
+        return self._macro_resolver.resolve_in_preset(flattened, file_paths=preset_file_paths)
 
-    def _get_preset_file_paths(self) -> dict[str, str]:
-        """Get mapping of preset names to their containing file paths."""
-        file_paths: dict[str, str] = {}
-        for filepath, file_data in self.parser.loaded_files.items():
-            for preset_key in PRESET_MAP.values():
-                if preset_key not in file_data:
-                    continue
-                for preset in file_data[preset_key]:
-                    name = preset.get("name")
-                    if name:
-                        file_paths[name] = filepath
-        return file_paths
+    @functools.cached_property
+    def _macro_resolver(self) -> MacroResolver:
+        """Resolver shared by all presets of this instance, so the built-in macros are computed once."""
+        return MacroResolver(self.root)
+
+    def _get_preset_file_paths(self) -> Mapping[str, str]:
+        """Get read-only mapping of preset names to their containing file paths."""
+        return MappingProxyType(self._file_paths)
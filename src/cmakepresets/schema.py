@@ -1,20 +1,31 @@
+import copy
+import functools
 import json
+import os
 import sys
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any, Final, cast
+from typing import TYPE_CHECKING, Any, Final, TypeVar, cast
 
 import certifi
-import jsonschema
-import requests
 
 from . import logger as mainLogger
 from .exceptions import SchemaDownloadError, VersionError
-from .utils import read_file_text, write_file_text
+from .utils import read_file_bytes, write_file_bytes_atomic
+
+# jsonschema and requests are imported where they are used, as they are costly to
+# import and not needed by code paths that only read cached data
+if TYPE_CHECKING:
+    import jsonschema
+    import requests
 
 logger: Final = mainLogger.getChild(__name__)
 
 _BUNDLED_SCHEMA_PATH = Path(__file__).resolve().parent / "data" / "schema.json"
 
+# Environment variable that, when set to "1", disables schema downloads
+_OFFLINE_ENV: Final = "CMAKEPRESETS_OFFLINE"
+
 # Schema version to CMake version mapping
 _schema_version_cmake_version: Final = {
     1: (3, 19, 0),
@@ -29,10 +40,91 @@ _schema_version_cmake_version: Final = {
     10: (3, 31, 0),
 }
 
+# Highest schema version this package knows about
+_MAX_KNOWN_SCHEMA_VERSION: Final = max(_schema_version_cmake_version)
+
 # Master branch URL (latest schema)
 MASTER_URL = "https://raw.githubusercontent.com/Kitware/CMake/refs/heads/master/Help/manual/presets/schema.json"
 VERSIONED_URL = "https://raw.githubusercontent.com/Kitware/CMake/refs/tags/v{}.{}.{}/Help/manual/presets/schema.json"
 
+# Connect and read timeouts for schema downloads
+_DOWNLOAD_TIMEOUT: Final = (3.05, 10)
+
+# Number of distinct schemas to keep derived data (validators etc.) for
+_SCHEMA_CACHE_SIZE: Final = 16
+
+# Number of documents per schema remembered as already validated
+_VALIDATED_DOCUMENTS_SIZE: Final = 128
+
+_T = TypeVar("_T")
+
+# In-process copies of master schemas read from disk, keyed by cache file path and
+# validated against the file's (mtime, size) so external updates are picked up
+_master_schema_memo: dict[str, tuple[tuple[int, int], dict[str, Any]]] = {}
+
+# Schemas loaded by this module for validation, keyed by id(). They come from the
+# CMake project and are not meta-validated again; holding them keeps their ids unique
+_trusted_schemas: dict[int, dict[str, Any]] = {}
+
+
+# Canonical JSON of trusted schemas, keyed by id(). Those schemas are held in
+# _trusted_schemas and never handed out, so their ids and contents stay fixed
+_trusted_schema_keys: dict[int, str | None] = {}
+
+
+def _get_schema_key(schema: dict[str, Any]) -> str | None:
+    """
+    Get a key identifying a schema by its current content.
+
+    Schemas loaded by this module are serialized once. Schemas from callers are
+    serialized on every lookup, so changes made to them between calls are seen.
+
+    Args:
+        schema: The schema to identify.
+
+    Returns:
+        The canonical JSON of the schema, or None if it cannot be serialized.
+    """
+    if _trusted_schemas.get(id(schema)) is not schema:
+        return _get_document_key(schema)
+
+    if id(schema) not in _trusted_schema_keys:
+        _trusted_schema_keys[id(schema)] = _get_document_key(schema)
+    return _trusted_schema_keys[id(schema)]
+
+
+def _per_schema_cache(func: Callable[[dict[str, Any]], _T]) -> Callable[[dict[str, Any]], _T]:
+    """
+    Memoize a function of a schema by the content of the schema dict.
+
+    Schemas are unhashable dicts, so results are keyed by their canonical JSON. Equal
+    schemas loaded separately, such as repeated get_schema() results, share one result.
+    Schemas that cannot be serialized are not cached.
+
+    Args:
+        func: Function taking a schema as its only argument.
+
+    Returns:
+        The memoized function.
+    """
+    cache: dict[str, _T] = {}
+
+    @functools.wraps(func)
+    def wrapper(schema: dict[str, Any]) -> _T:
+        key = _get_schema_key(schema)
+        if key is None:
+            return func(schema)
+        if key in cache:
+            return cache[key]
+
+        value = func(schema)
+        if len(cache) >= _SCHEMA_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[key] = value
+        return value
+
+    return wrapper
+
 
 def get_schema(version: int) -> dict[str, Any]:  # noqa: C901
     """
@@ -57,11 +149,14 @@ def get_schema(version: int) -> dict[str, Any]:  # noqa: C901
     cache_dir = Path.home() / ".cache" / "cmakepresets-schema"
     cache_file = cache_dir / f"schema-v{version}.json"
 
+    # A cached copy that was read but rejected must not be revalidated, as a 304 would return it again
+    rejected_cache_file: Path | None = None
+
     # Try to load from cache first
     if cache_file.exists():
         try:
             logger.debug(f"Found cached schema at {cache_file}")
-            schema: dict[str, Any] = json.loads(read_file_text(cache_file))
+            schema: dict[str, Any] = json.loads(read_file_bytes(cache_file))
 
             # Check if the cached schema supports the requested version
             if schema_has_version(schema, version):
@@ -69,11 +164,15 @@ def get_schema(version: int) -> dict[str, Any]:  # noqa: C901
                 return schema
             else:
                 logger.debug(f"Cached schema does not support version {version}, will download")
+                rejected_cache_file = cache_file
         except (OSError, json.JSONDecodeError) as e:
             logger.debug(f"Error reading cached schema: {e}")
     else:
         logger.debug(f"No cached schema found for version {version}")
 
+    if _downloads_disabled():
+        return _get_bundled_schema(version)
+
     # Determine the URL to download the schema based on version
     url = get_schema_url_for_version(version)
     logger.info(f"Downloading schema for version {version} from {url}")
@@ -92,10 +191,10 @@ def get_schema(version: int) -> dict[str, Any]:  # noqa: C901
         logger.debug("pyfakefs or pytest detected in sys.modules; not forcing certifi bundle path")
         verify_param = True
 
+    import requests
+
     try:
-        response = requests.get(url, timeout=10, verify=verify_param)
-        response.raise_for_status()
-        schema = response.json()
+        schema, response = _download_schema(url, cache_file, verify_param, conditional=cache_file != rejected_cache_file)
         logger.debug(f"Successfully downloaded schema from {url}")
 
         # Check if the downloaded schema supports the requested version
@@ -104,9 +203,7 @@ def get_schema(version: int) -> dict[str, Any]:  # noqa: C901
             raise SchemaDownloadError(f"Downloaded schema does not support version {version}")
 
         # Save the downloaded schema to the cache
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        write_file_text(cache_file, json.dumps(schema))
-        logger.debug(f"Saved schema to cache at {cache_file}")
+        _save_schema_cache(cache_file, response)
 
         logger.info(f"Successfully retrieved schema for version {version}")
         return schema
@@ -116,15 +213,11 @@ def get_schema(version: int) -> dict[str, Any]:  # noqa: C901
         logger.info(f"Certificate verification failed when downloading schema: {e}; retrying without forcing cert bundle path")
         try:
             # Retry without verification.
-            response = requests.get(url, timeout=10, verify=False)
-            response.raise_for_status()
-            schema = response.json()
+            schema, response = _download_schema(url, cache_file, False, conditional=cache_file != rejected_cache_file)
             logger.debug(f"Successfully downloaded schema from {url} on retry (verify=False)")
 
             # Save the downloaded schema to the cache
-            cache_dir.mkdir(parents=True, exist_ok=True)
-            write_file_text(cache_file, json.dumps(schema))
-            logger.debug(f"Saved schema to cache at {cache_file}")
+            _save_schema_cache(cache_file, response)
 
             logger.info(f"Successfully retrieved schema for version {version}")
             return schema
@@ -134,8 +227,7 @@ def get_schema(version: int) -> dict[str, Any]:  # noqa: C901
             if "pyfakefs" in sys.modules or "pytest" in sys.modules:
                 logger.info("Using bundled schema file as fallback in test environment")
                 try:
-                    schema_text = read_file_text(_BUNDLED_SCHEMA_PATH)
-                    schema = json.loads(schema_text)
+                    schema = json.loads(read_file_bytes(_BUNDLED_SCHEMA_PATH))
                     return schema
                 except (OSError, json.JSONDecodeError) as e3:
                     logger.error(f"Failed to read bundled schema fallback: {e3}")
@@ -146,6 +238,147 @@ def get_schema(version: int) -> dict[str, Any]:  # noqa: C901
         raise SchemaDownloadError(f"Failed to download schema: {e}")
 
 
+def _downloads_disabled() -> bool:
+    """Check whether schema downloads are disabled through the environment."""
+    return os.environ.get(_OFFLINE_ENV) == "1"
+
+
+def _get_bundled_schema(version: int) -> dict[str, Any]:
+    """
+    Get the schema bundled with the package, for use when downloads are disabled.
+
+    Args:
+        version: The schema version number the schema must support.
+
+    Returns:
+        The bundled schema as a dictionary.
+
+    Raises:
+        SchemaDownloadError: If the bundled schema cannot be read or doesn't support the requested version.
+    """
+    logger.info(f"Schema downloads are disabled by {_OFFLINE_ENV}; using bundled schema for version {version}")
+    try:
+        schema: dict[str, Any] = json.loads(read_file_bytes(_BUNDLED_SCHEMA_PATH))
+    except (OSError, json.JSONDecodeError) as e:
+        raise SchemaDownloadError(f"Failed to read bundled schema: {e}") from e
+
+    if not schema_has_version(schema, version):
+        raise SchemaDownloadError(f"Schema for version {version} is not cached and downloads are disabled by {_OFFLINE_ENV}")
+    return schema
+
+
+@functools.cache
+def _get_session() -> "requests.Session":
+    """
+    Get the HTTP session used for schema downloads.
+
+    The session is shared so several downloads in one run reuse the same pooled
+    connection. Transient server errors are retried; connection failures are not,
+    so offline runs fall back quickly.
+
+    Returns:
+        The shared session.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter, Retry
+
+    from . import __version__
+
+    retry = Retry(total=3, connect=0, read=0, backoff_factor=0.3, status_forcelist=[502, 503, 504], allowed_methods=["GET"], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = f"cmakepresets/{__version__}"
+    return session
+
+
+def _get_cache_meta_file(cache_file: Path) -> Path:
+    """Get the path of the file holding HTTP validators (ETag etc.) for a cached schema."""
+    return cache_file.with_name(f"{cache_file.stem}.meta.json")
+
+
+def _get_conditional_headers(cache_file: Path) -> dict[str, str]:
+    """
+    Build conditional request headers from a previous download of a cached schema.
+
+    Args:
+        cache_file: Path of the cached schema.
+
+    Returns:
+        The If-None-Match/If-Modified-Since headers, empty if there is nothing cached.
+    """
+    if not cache_file.exists():
+        return {}
+
+    try:
+        meta = json.loads(read_file_bytes(_get_cache_meta_file(cache_file)))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+    headers: dict[str, str] = {}
+    if isinstance(meta.get("etag"), str):
+        headers["If-None-Match"] = meta["etag"]
+    if isinstance(meta.get("last_modified"), str):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def _download_schema(url: str, cache_file: Path, verify: bool | str, conditional: bool = True) -> tuple[dict[str, Any], "requests.Response"]:
+    """
+    Download a schema, reusing the cached copy if the server reports it unchanged.
+
+    Args:
+        url: The URL to download the schema from.
+        cache_file: Path of the cached copy of this schema.
+        verify: TLS verification parameter passed to requests.
+        conditional: Whether the cached copy may be reused; if False a full download is always made.
+
+    Returns:
+        The schema and the response it came from (status 304 if the cached copy was reused).
+
+    Raises:
+        requests.RequestException: If the download fails.
+        json.JSONDecodeError: If the downloaded schema is not valid JSON.
+    """
+    headers = _get_conditional_headers(cache_file) if conditional else {}
+    response = _get_session().get(url, timeout=_DOWNLOAD_TIMEOUT, verify=verify, headers=headers)
+
+    if response.status_code == 304:
+        try:
+            logger.debug(f"Schema at {url} not modified, using cached copy {cache_file}")
+            return cast(dict[str, Any], json.loads(read_file_bytes(cache_file))), response
+        except (OSError, json.JSONDecodeError) as e:
+            logger.debug(f"Error reading cached schema after 304 response: {e}")
+            response = _get_session().get(url, timeout=_DOWNLOAD_TIMEOUT, verify=verify)
+
+    response.raise_for_status()
+    return cast(dict[str, Any], json.loads(response.content)), response
+
+
+def _save_schema_cache(cache_file: Path, response: "requests.Response") -> None:
+    """
+    Save a downloaded schema and its HTTP validators to the cache.
+
+    The response body is stored as received, and files are replaced atomically so an
+    interrupted write never leaves a truncated cache behind. Nothing is written if the
+    response was a 304, as the cached copy is already current.
+
+    Args:
+        cache_file: Path to save the schema to.
+        response: The response the schema came from.
+    """
+    if response.status_code == 304:
+        return
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    write_file_bytes_atomic(cache_file, response.content)
+
+    meta = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+    write_file_bytes_atomic(_get_cache_meta_file(cache_file), json.dumps(meta).encode())
+    logger.debug(f"Saved schema to cache at {cache_file}")
+
+
 def get_schema_url_for_version(version: int) -> str:
     """
     Determine the correct GitHub URL for the schema based on the requested version.
@@ -176,7 +409,23 @@ def get_latest_master_schema(force_download: bool = False) -> dict[str, Any]:
         force_download: If True, download a fresh copy even if cached version exists.
 
     Returns:
-        The schema as a dictionary.
+        The schema as a dictionary, owned by the caller.
+
+    Raises:
+        SchemaDownloadError: If the schema cannot be downloaded.
+    """
+    return copy.deepcopy(_get_latest_master_schema(force_download))
+
+
+def _get_latest_master_schema(force_download: bool = False) -> dict[str, Any]:
+    """
+    Get the latest schema from the master branch, sharing the in-process copy of the cached file.
+
+    Args:
+        force_download: If True, download a fresh copy even if cached version exists.
+
+    Returns:
+        The schema as a dictionary, which must not be modified.
 
     Raises:
         SchemaDownloadError: If the schema cannot be downloaded.
@@ -190,25 +439,35 @@ def get_latest_master_schema(force_download: bool = False) -> dict[str, Any]:
     # Use cached version if available and not forcing download
     if not force_download and cache_file.exists():
         try:
+            stat = cache_file.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            memo = _master_schema_memo.get(str(cache_file))
+            if memo is not None and memo[0] == stamp:
+                logger.debug("Using in-process copy of cached master schema")
+                return memo[1]
+
             logger.debug(f"Using cached master schema from {cache_file}")
-            return cast(dict[str, Any], json.loads(read_file_text(cache_file)))
+            cached_schema = cast(dict[str, Any], json.loads(read_file_bytes(cache_file)))
+            _master_schema_memo[str(cache_file)] = (stamp, cached_schema)
+            return cached_schema
         except (OSError, json.JSONDecodeError) as e:
             logger.debug(f"Error reading cached master schema: {e}")
     else:
         if not force_download:
             logger.debug("No cached master schema found")
 
+    if _downloads_disabled():
+        raise SchemaDownloadError(f"Latest schema is not cached and downloads are disabled by {_OFFLINE_ENV}")
+
     logger.info("Downloading latest schema from master branch")
+    import requests
+
     try:
-        response = requests.get(MASTER_URL, timeout=10, verify=certifi.where())
-        response.raise_for_status()
-        schema: dict[str, Any] = response.json()
+        schema, response = _download_schema(MASTER_URL, cache_file, certifi.where())
         logger.debug("Successfully downloaded master schema")
 
         # Save the downloaded schema to the cache
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        write_file_text(cache_file, json.dumps(schema))
-        logger.debug(f"Saved master schema to cache at {cache_file}")
+        _save_schema_cache(cache_file, response)
 
         return schema
     except (requests.RequestException, json.JSONDecodeError) as e:
@@ -227,26 +486,44 @@ def schema_has_version(schema: dict[str, Any], version: int) -> bool:
     Returns:
         True if the schema supports the specified version, False otherwise.
     """
-    if "oneOf" in schema:
-        for variant in schema.get("oneOf", []):
-            if "properties" in variant and "version" in variant["properties"]:
-                version_property = variant["properties"]["version"]
-                if "const" in version_property and version_property["const"] == version:
-                    return True
-    return False
+    return version in _get_schema_versions(schema)
 
 
-def validate_json_against_schema(data: dict[str, Any], schema: dict[str, Any]) -> None:
+@functools.cache
+def _get_schema_for_version(version: int) -> dict[str, Any]:
+    """
+    Get the schema for a version once per process.
+
+    Keeping one schema object per version lets every validation of that version
+    reuse the same compiled validators.
+
+    Args:
+        version: The schema version number to get.
+
+    Returns:
+        The schema as a dictionary.
+    """
+    schema = get_schema(version)
+    _trusted_schemas[id(schema)] = schema
+    return schema
+
+
+def validate_json_against_schema(data: dict[str, Any], schema: dict[str, Any] | None = None) -> None:
     """
     Validate JSON data against a schema.
 
     Args:
         data: The JSON data to validate.
-        schema: The JSON schema to validate against.
+        schema: The JSON schema to validate against. If omitted, the schema for the
+            document's own version is used, loaded once per process.
 
     Raises:
         jsonschema.exceptions.ValidationError: If the data does not validate against the schema.
+        VersionError: If no schema is given and the document's version is missing or unsupported.
+        SchemaDownloadError: If no schema is given and the schema for the document's version cannot be obtained.
     """
+    import jsonschema
+
     doc_version = data.get("version", "unknown")
     logger.debug(f"Validating document with version {doc_version} against schema")
 
@@ -254,6 +531,11 @@ def validate_json_against_schema(data: dict[str, Any], schema: dict[str, Any]) -
         logger.warning("Document uses unsupported schema version 1")
         raise VersionError("Unsupported schema version: 1")
 
+    if schema is None:
+        if type(doc_version) is not int:
+            raise VersionError(f"Missing or invalid version: {doc_version}")
+        schema = _get_schema_for_version(doc_version)
+
     try:
         # Handle future versions and attempt validation
         if _is_future_version(data, schema):
@@ -264,7 +546,7 @@ def validate_json_against_schema(data: dict[str, Any], schema: dict[str, Any]) -
             logger.warning(f"Could not validate document with version {doc_version} using any available schema")
 
         # Proceed with normal validation
-        jsonschema.validate(data, schema)
+        _validate(data, schema)
         logger.debug("Document successfully validated against schema")
     except jsonschema.exceptions.ValidationError as e:
         # Improve error reporting
@@ -282,6 +564,93 @@ def validate_json_against_schema(data: dict[str, Any], schema: dict[str, Any]) -
         raise
 
 
+@_per_schema_cache
+def _get_validator(schema: dict[str, Any]) -> "jsonschema.protocols.Validator":
+    """Build a validator for the schema, checking the schema itself once unless it was loaded by this module."""
+    import jsonschema
+
+    cls = jsonschema.validators.validator_for(schema)
+    if _trusted_schemas.get(id(schema)) is not schema:
+        cls.check_schema(schema)
+    return cls(schema)
+
+
+@_per_schema_cache
+def _get_version_validators(schema: dict[str, Any]) -> dict[int, "jsonschema.protocols.Validator"]:
+    """
+    Build validators specialized for each version variant of the schema.
+
+    The presets schema is a oneOf over variants distinguished by a constant version,
+    so a document can only ever match the variant for its own version. Checking that
+    variant alone (plus the other top-level constraints) avoids evaluating every variant.
+
+    Args:
+        schema: The JSON schema to specialize.
+
+    Returns:
+        Mapping of version to specialized validator, empty if the schema is not split by version.
+    """
+    variants = schema.get("oneOf", [])
+    common = {key: value for key, value in schema.items() if key not in ("oneOf", "definitions")}
+    validators: dict[int, "jsonschema.protocols.Validator"] = {}
+    for variant in variants:
+        version = _get_variant_version(variant)
+        if version is None or version in validators:
+            return {}
+        validators[version] = _get_validator(schema).evolve(schema={"allOf": [common, variant]})
+    return validators
+
+
+def _validate(data: dict[str, Any], schema: dict[str, Any]) -> None:
+    """Validate data like jsonschema.validate, but reusing a cached validator."""
+    import jsonschema
+
+    validator = _get_validator(schema)
+
+    # Identical documents that already passed against this schema need no work
+    validated = _get_validated_documents(schema)
+    document_key = _get_document_key(data)
+    if document_key is not None and document_key in validated:
+        return
+
+    # Fast path: a valid document only needs its own version's variant checked.
+    # Anything else goes through full validation so errors are reported unchanged.
+    version = data.get("version") if isinstance(data, dict) else None
+    version_validator = _get_version_validators(schema).get(version) if type(version) is int else None
+    if version_validator is None or not version_validator.is_valid(data):
+        error = jsonschema.exceptions.best_match(validator.iter_errors(data))
+        if error is not None:
+            raise error
+
+    if document_key is not None:
+        if len(validated) >= _VALIDATED_DOCUMENTS_SIZE:
+            validated.clear()
+        validated.add(document_key)
+
+
+@_per_schema_cache
+def _get_validated_documents(schema: dict[str, Any]) -> set[str]:
+    """Get the set of canonical documents known to be valid against the schema."""
+    return set()
+
+
+def _get_document_key(data: Any) -> str | None:
+    """Get a canonical JSON representation of a document, or None if it cannot be serialized."""
+    try:
+        return json.dumps(data, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_variant_version(variant: Any) -> int | None:
+    """Get the constant version a oneOf variant of the schema applies to, if any."""
+    try:
+        version = variant["properties"]["version"]["const"]
+    except (KeyError, TypeError):
+        return None
+    return version if type(version) is int else None
+
+
 def _is_version_1(data: dict[str, Any]) -> bool:
     if "version" in data and data["version"] == 1:
         return True
@@ -293,37 +662,43 @@ def _is_future_version(data: dict[str, Any], schema: dict[str, Any]) -> bool:
     if "oneOf" not in schema or "version" not in data:
         return False
 
-    schema_versions = _get_schema_versions(schema)
-    return data["version"] not in schema_versions and data["version"] > max(schema_versions, default=0)
+    # Anything above the highest defined version is necessarily not defined in the schema
+    return bool(data["version"] > _get_max_schema_version(schema))
 
 
-def _get_schema_versions(schema: dict[str, Any]) -> set[int]:
+@_per_schema_cache
+def _get_schema_versions(schema: dict[str, Any]) -> frozenset[int]:
     """Extract all version numbers defined in the schema."""
     schema_versions: set[int] = set()
-    for variant in schema.get("oneOf", []):
-        if "properties" in variant and "version" in variant["properties"]:
-            version_property = variant["properties"]["version"]
-            if "const" in version_property and isinstance(version_property["const"], int):
-                schema_versions.add(version_property["const"])
-    return schema_versions
+    for variant in schema.get("oneOf", ()):
+        version = _get_variant_version(variant)
+        if version is not None:
+            schema_versions.add(version)
+    return frozenset(schema_versions)
+
+
+@_per_schema_cache
+def _get_max_schema_version(schema: dict[str, Any]) -> int:
+    """Get the highest version defined in the schema, or 0 if it defines none."""
+    return max(_get_schema_versions(schema), default=0)
 
 
 def _try_validate_future_version(data: dict[str, Any], schema: dict[str, Any]) -> bool:
     """Try to validate a future version against the highest known version in schema."""
+    import jsonschema
 
     def try_validation_with_schema(schema_to_use: dict[str, Any], description: str) -> bool:
         """Helper to attempt validation with a given schema."""
-        schema_versions = _get_schema_versions(schema_to_use)
-        if not schema_versions:
+        highest_version = _get_max_schema_version(schema_to_use)
+        if not highest_version:
             return False
 
-        highest_version = max(schema_versions)
         validation_data = data.copy()
         validation_data["version"] = highest_version
 
         try:
             logger.warning(f"{description} (version {highest_version})")
-            jsonschema.validate(validation_data, schema_to_use)
+            _validate(validation_data, schema_to_use)
             return True
         except jsonschema.exceptions.ValidationError:
             return False
@@ -335,12 +710,12 @@ def _try_validate_future_version(data: dict[str, Any], schema: dict[str, Any]) -
 
     try:
         # Try with cached master schema
-        master_schema = get_latest_master_schema()
+        master_schema = _get_latest_master_schema()
         if try_validation_with_schema(master_schema, "Trying validation against latest cached schema"):
             return True
 
         # Last attempt with freshly downloaded schema
-        master_schema = get_latest_master_schema(force_download=True)
+        master_schema = _get_latest_master_schema(force_download=True)
         return try_validation_with_schema(master_schema, "Trying validation against freshly downloaded schema")
 
     except SchemaDownloadError:
@@ -350,39 +725,42 @@ def _try_validate_future_version(data: dict[str, Any], schema: dict[str, Any]) -
     return False
 
 
+@_per_schema_cache
 def _get_feature_min_versions(schema: dict[str, Any]) -> dict[str, int]:
     """Extract the minimum version required for each field in the schema."""
-    feature_min_versions = {}
-
-    for variant in schema.get("oneOf", []):
-        if "properties" in variant and "version" in variant["properties"]:
-            variant_version = variant["properties"]["version"].get("const")
-            if variant_version is not None:
-                for field_name in variant.get("properties", {}):
-                    if field_name != "version":
-                        if field_name not in feature_min_versions:
-                            feature_min_versions[field_name] = variant_version
-                        else:
-                            feature_min_versions[field_name] = min(feature_min_versions[field_name], variant_version)
+    versioned_variants: list[tuple[int, dict[str, Any]]] = []
+    for variant in schema.get("oneOf", ()):
+        variant_version = _get_variant_version(variant)
+        if variant_version is not None:
+            versioned_variants.append((variant_version, variant["properties"]))
+
+    # Visiting variants oldest first means the first version seen for a field is its minimum
+    versioned_variants.sort(key=lambda item: item[0])
+
+    feature_min_versions: dict[str, int] = {}
+    for variant_version, properties in versioned_variants:
+        for field_name in properties:
+            feature_min_versions.setdefault(field_name, variant_version)
+    feature_min_versions.pop("version", None)
 
     return feature_min_versions
 
 
-def _get_improved_error_message(data: dict[str, Any], original_error: jsonschema.exceptions.ValidationError) -> str | None:
+def _get_improved_error_message(data: dict[str, Any], original_error: "jsonschema.exceptions.ValidationError") -> str | None:
     """Generate a more helpful error message for schema validation failures."""
-    # Check for version compatibility with specific fields
-    if "version" in data:
-        version = data["version"]
-
+    # Check for version compatibility with specific fields. Documents at or above the
+    # newest known version cannot use a field that is too new, so skip the master schema.
+    version = data.get("version")
+    if version is not None and not (type(version) is int and version >= _MAX_KNOWN_SCHEMA_VERSION):
         # Try to get the latest master schema to provide better field version information
         try:
-            master_schema = get_latest_master_schema()
+            master_schema = _get_latest_master_schema()
             feature_min_versions = _get_feature_min_versions(master_schema)
 
             # First check for fields that require newer versions
-            for field in data:
-                if field in feature_min_versions and version < feature_min_versions[field]:
-                    return f"The '{field}' field is first available in version {feature_min_versions[field]} or higher, but document version is {version}"
+            field = next((f for f in data if f in feature_min_versions and version < feature_min_versions[f]), None)
+            if field is not None:
+                return f"The '{field}' field is first available in version {feature_min_versions[field]} or higher, but document version is {version}"
         except SchemaDownloadError:
             # If we can't download the schema, continue with basic error handling
             logger.debug("Could not download master schema for improved error messages")
@@ -1,11 +1,50 @@
+import os
+import tempfile
 from pathlib import Path
 
 
 def read_file_text(filepath: Path) -> str:
     """Read and return the text content of the given file."""
-    return filepath.read_text(encoding="utf-8")
+    return read_file_bytes(filepath).decode("utf-8")
+
+
+def read_file_bytes(filepath: Path) -> bytes:
+    """Read and return the raw content of the given file."""
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        chunks = []
+        # Read until EOF; the reported size is only a hint (e.g. for growing or special files)
+        while chunk := os.read(fd, max(size, 1 << 16)):
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return b"".join(chunks)
 
 
 def write_file_text(filepath: Path, content: str) -> None:
     """Write the given content to the file."""
-    filepath.write_text(content, encoding="utf-8")
+    data = memoryview(content.encode("utf-8"))
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
+
+
+def write_file_bytes_atomic(filepath: Path, content: bytes) -> None:
+    """Write the given content to the file, replacing it atomically so readers never see a partial file."""
+    # A unique temporary file per writer keeps concurrent writers from sharing a partial file
+    fd, tmp_name = tempfile.mkstemp(dir=filepath.parent, prefix=f"{filepath.name}.", suffix=".tmp")
+    try:
+        data = memoryview(content)
+        try:
+            while data:
+                data = data[os.write(fd, data) :]
+        finally:
+            os.close(fd)
+        os.replace(tmp_name, filepath)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -85,42 +85,64 @@ class CMakePresets_json:
         if not fs.exists(self.mock_cwd):
             fs.create_dir(self.mock_cwd)
 
+        for filename, file_content in self.files.items():
+            self._write_file(fs, filename, file_content)
+
+    @functools.cached_property
+    def files(self) -> dict[str, str]:
+        """
+        File contents to create, by filename, serialized once per decorated test.
+
+        Parametrized tests and repeated context manager use share the result.
+        """
         # Case 1: Content is a string (JSON content for CMakePresets.json)
         if isinstance(self.content, str):
-            self._create_file(fs, "CMakePresets.json", self.content)
-            return
+            return {"CMakePresets.json": self._serialize_text("CMakePresets.json", self.content)}
 
         # Case 2: Content is a dictionary that represents a single JSON object
-        if isinstance(self.content, dict):
-            # Check if this dict appears to be a mapping of filenames to content
-            # It's a file mapping if values are strings or dicts
-            is_file_mapping = False
-
-            for key, value in self.content.items():
-                # If any key seems like a filepath with extension or directory separator
-                if isinstance(key, str) and ("." in key or "/" in key or "\\" in key):
-                    is_file_mapping = True
-                    break
-
-            # If it's not a file mapping, treat the whole dict as CMakePresets.json content
-            if not is_file_mapping:
-                self._create_file(fs, "CMakePresets.json", json.dumps(self.content))
-                return
-
-            # Case 3: Content is a dictionary mapping filenames to content
-            for filename, file_content in self.content.items():
-                if isinstance(file_content, dict):
-                    file_content_str = json.dumps(file_content)
-                elif not isinstance(file_content, str):
-                    file_content_str = json.dumps(file_content)
-                else:
-                    file_content_str = file_content
-
-                self._create_file(fs, filename, file_content_str)
-
-    def _create_file(self, fs: Any, filepath: str, content: str) -> None:
+        # Check if this dict appears to be a mapping of filenames to content
+        # It's a file mapping if any key seems like a filepath with extension or directory separator
+        is_file_mapping = any(isinstance(key, str) and ("." in key or "/" in key or "\\" in key) for key in self.content)
+
+        # If it's not a file mapping, treat the whole dict as CMakePresets.json content
+        if not is_file_mapping:
+            return {"CMakePresets.json": json.dumps(self.content)}
+
+        # Case 3: Content is a dictionary mapping filenames to content
+        return {
+            filename: self._serialize_text(filename, file_content) if isinstance(file_content, str) else json.dumps(file_content)
+            for filename, file_content in self.content.items()
+        }
+
+    def _serialize_text(self, filepath: str, content: str) -> str:
+        """
+        Check JSON text destined for the fake filesystem.
+
+        Args:
+            filepath: Path of the file the content is for (relative or absolute)
+            content: JSON content to write to the file
+
+        Returns:
+            The content as given, or an empty object for blank content
+
+        Raises:
+            ValueError: If the content is not valid JSON
+        """
+        # Parse the content to ensure it's valid JSON, but write it as given
+        if not content.strip():
+            content = "{}"
+        try:
+            json.loads(content)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in test content for {filepath}: {e}")
+
+        return content
+
+    def _write_file(self, fs: Any, filepath: str, content: str) -> None:
         """
-        Create a file in the fake filesystem, creating parent directories as needed.
+        Write a file in the fake filesystem.
+
+        Missing parent directories are created by the fake filesystem itself.
 
         Args:
             fs: The fake filesystem
@@ -131,24 +153,6 @@ class CMakePresets_json:
         if not Path(filepath).is_absolute():
             filepath = os.path.join(self.mock_cwd, filepath)
 
-        path = Path(filepath)
-
-        # Make sure parent directories exist
-        if path.parent != Path(".") and path.parent != Path("/"):
-            os.makedirs(path.parent, exist_ok=True)
-
-        # Parse the content to ensure it's valid JSON
-        try:
-            if not content.strip():
-                json_content = {}
-            else:
-                json_content = json.loads(content)
-
-            # Format the JSON properly for consistent testing
-            formatted_content = json.dumps(json_content, indent=2)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON in test content for {filepath}: {e}")
-
         # Create the file
         # If a file already exists at this path in the fake filesystem,
         # remove it before creating the new one. Some pyfakefs versions
@@ -166,4 +170,4 @@ class CMakePresets_json:
             # resulting error will surface normally.
             pass
 
-        fs.create_file(filepath, contents=formatted_content)
+        fs.create_file(filepath, contents=content)
@@ -1,78 +1,122 @@
 import argparse
+import io
 import json
+import subprocess
+import sys
 from collections.abc import Generator
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from typing import Any, cast
+from unittest.mock import MagicMock
 
 import pytest
+from rich.console import Console
 from rich.table import Table
 
-from cmakepresets import __name__, cli
+from cmakepresets import __name__, cli, console, log, logger
 from cmakepresets.constants import BUILD, CONFIGURE, PRESET_MAP, TEST
 from cmakepresets.presets import CMakePresets
 
 from .decorators import CMakePresets_json
 
 
-@pytest.fixture(scope="function")  # type: ignore[misc]
-def mock_console_print() -> Generator[MagicMock]:
-    """Fixture to mock console.print to capture output."""
-    with patch("cmakepresets.cli.console.print") as mock_print:
-        yield mock_print
+@pytest.fixture(autouse=True)  # type: ignore[misc]
+def default_log_level() -> Generator[None]:
+    """Fixture to run each test at the CLI's default log level, as handlers called directly do not set it."""
+    level = logger.level
+    logger.setLevel(log.ERROR)
+    yield
+    logger.setLevel(level)
 
 
 @pytest.fixture(scope="function")  # type: ignore[misc]
-def mock_presets() -> MagicMock:
-    """Fixture to create a mock CMakePresets instance."""
-    presets = MagicMock(spec=CMakePresets)
-
-    # Configure mock with some test data
-    presets.configure_presets = [
-        {"name": "default", "generator": "Ninja", "hidden": False, "default": True},
-        {"name": "debug", "generator": "Ninja", "hidden": False},
-        {"name": "hidden-preset", "generator": "Ninja", "hidden": True},
-    ]
+def mock_console_print(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Fixture to mock console.print to capture output, as if writing to a terminal."""
+    mock_print = MagicMock()
+    monkeypatch.setattr(console, "print", mock_print)
+    monkeypatch.setattr(console, "_force_terminal", True)
+    return mock_print
 
-    presets.build_presets = [
-        {"name": "default-build", "configurePreset": "default", "hidden": False},
-        {"name": "debug-build", "configurePreset": "debug", "hidden": False, "default": True},
-    ]
 
-    presets.test_presets = [
-        {"name": "default-test", "configurePreset": "default"},
-    ]
+def _use_parsed_args(monkeypatch: pytest.MonkeyPatch, argv: list[str], args: argparse.Namespace) -> None:
+    """Make the CLI see argv as its command line and have argument parsing return args."""
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(argparse.ArgumentParser, "parse_args", lambda *_, **__: args)
 
-    # Setup mock methods
-    presets.get_preset_by_name.side_effect = lambda preset_type, name: next(
-        (p for p in getattr(presets, f"{preset_type}_presets") if p.get("name") == name),
-        None,
-    )
 
-    # Setup preset tree for related commands
-    preset_tree = {
-        "default": {
-            "preset": presets.configure_presets[0],
-            "dependents": {
-                PRESET_MAP[BUILD]: [presets.build_presets[0]],
-                PRESET_MAP[TEST]: [presets.test_presets[0]],
+@pytest.fixture(scope="function")  # type: ignore[misc]
+def console_output(monkeypatch: pytest.MonkeyPatch) -> io.StringIO:
+    """Fixture to capture CLI output as plain text rendered by a real console acting as a terminal."""
+    output = io.StringIO()
+    monkeypatch.setattr(cli, "console", Console(file=output, width=200, force_terminal=True, color_system=None))
+    return output
+
+
+class _FakePresets:
+    """Lightweight stand-in for CMakePresets holding a fixed set of presets."""
+
+    def __init__(self) -> None:
+        self.configure_presets = [
+            {"name": "default", "generator": "Ninja", "hidden": False, "default": True},
+            {"name": "debug", "generator": "Ninja", "hidden": False},
+            {"name": "hidden-preset", "generator": "Ninja", "hidden": True},
+        ]
+        self.build_presets = [
+            {"name": "default-build", "configurePreset": "default", "hidden": False},
+            {"name": "debug-build", "configurePreset": "debug", "hidden": False, "default": True},
+        ]
+        self.test_presets = [
+            {"name": "default-test", "configurePreset": "default"},
+        ]
+        self.package_presets: list[dict[str, Any]] = []
+        self.workflow_presets: list[dict[str, Any]] = []
+
+    def get_preset_by_name(self, preset_type: str, name: str) -> dict[str, Any] | None:
+        return next((p for p in getattr(self, f"{preset_type}_presets") if p.get("name") == name), None)
+
+    def get_preset_tree(self) -> dict[str, Any]:
+        return {
+            "default": {
+                "preset": self.configure_presets[0],
+                "dependents": {
+                    PRESET_MAP[BUILD]: [self.build_presets[0]],
+                    PRESET_MAP[TEST]: [self.test_presets[0]],
+                },
             },
-        },
-        "debug": {
-            "preset": presets.configure_presets[1],
-            "dependents": {
-                PRESET_MAP[BUILD]: [presets.build_presets[1]],
-                PRESET_MAP[TEST]: [],
+            "debug": {
+                "preset": self.configure_presets[1],
+                "dependents": {
+                    PRESET_MAP[BUILD]: [self.build_presets[1]],
+                    PRESET_MAP[TEST]: [],
+                },
             },
-        },
-    }
-    presets.get_preset_tree.return_value = preset_tree
+        }
+
+
+@pytest.fixture(scope="module")  # type: ignore[misc]
+def mock_presets() -> CMakePresets:
+    """Fixture to create a stand-in CMakePresets instance, shared by the module's tests since they only read it."""
+    return cast(CMakePresets, _FakePresets())
+
+
+def test_import_does_not_load_rich_renderables() -> None:
+    """Importing the CLI should not import Rich's table and tree modules until output needs them."""
+    code = "import sys, cmakepresets.cli; print(sorted({'rich.table', 'rich.tree'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
 
-    return presets
+    assert result.stdout.strip() == "[]"
+
+
+def test_run_as_module() -> None:
+    """Test that the CLI can be run with python -m."""
+    result = subprocess.run([sys.executable, "-m", "cmakepresets", "--help"], capture_output=True, text=True, check=False)
+
+    assert result.returncode == 0
+    assert "CMake Presets utility" in result.stdout
 
 
 def test_create_parser() -> None:
     """Test that the argument parser is created with the expected subcommands."""
-    parser = cli.create_parser()
+    parser = cli.create_parser([])
 
     # Check parser is created
     assert isinstance(parser, argparse.ArgumentParser)
@@ -89,7 +133,44 @@ def test_create_parser() -> None:
     assert "related" in choices
 
 
-def test_get_presets_by_type(mock_presets: MagicMock) -> None:
+@pytest.mark.parametrize(
+    "argv,expected",
+    [
+        (["show", "default"], ["show"]),
+        (["--file", "list", "related", "default"], ["related"]),
+        (["-d", "build", "-vv", "list", "--flat"], ["list"]),
+        (["--help"], ["list", "show", "related"]),
+        (["unknown"], ["list", "show", "related"]),
+    ],
+)  # type: ignore[misc]
+def test_create_parser_builds_requested_subcommand(argv: list[str], expected: list[str]) -> None:
+    """Test that only the requested subcommand parser is built."""
+    parser = cli.create_parser(argv)
+
+    subparsers = next(action for action in parser._actions if isinstance(action, argparse._SubParsersAction))
+    assert list(subparsers.choices) == expected
+
+
+@pytest.fixture(scope="function")  # type: ignore[misc]
+def clear_parser_cache() -> Generator[None]:
+    """Fixture to start and end a test with no cached argument parsers."""
+    cli._build_parser.cache_clear()
+    yield
+    cli._build_parser.cache_clear()
+
+
+@pytest.mark.usefixtures("clear_parser_cache")  # type: ignore[misc]
+def test_create_parser_is_reused() -> None:
+    """Test that the parser for a subcommand is built once and shared between calls."""
+    parser = cli.create_parser(["--file", "CMakePresets.json", "list"])
+
+    assert cli.create_parser(["-d", ".", "list", "--flat"]) is parser
+    assert cli.create_parser(["show", "default"]) is not parser
+    assert cli.create_parser(["unknown"]) is cli.create_parser([])
+    assert cli._build_parser.cache_info().misses == 3
+
+
+def test_get_presets_by_type(mock_presets: CMakePresets) -> None:
     """Test getting presets of different types."""
     result = cli.get_presets_by_type(mock_presets, CONFIGURE)
     assert result == mock_presets.configure_presets
@@ -144,18 +225,18 @@ def test_handle_list_command_flat(mock_console_print: MagicMock) -> None:
     """Test the list command with flat output."""
     args = argparse.Namespace(file="CMakePresets.json", directory=None, command="list", type=CONFIGURE, show_hidden=False, flat=True, verbose=10)
 
-    with patch("sys.argv", [__name__, "-vvvv", "list", "--type", CONFIGURE, "--flat"]):
-        with patch("argparse.ArgumentParser.parse_args", return_value=args):
-            result = cli.main()
+    presets = CMakePresets("CMakePresets.json")
+    result = cli.handle_list_command(presets, args)
 
-            assert result == 0
-            mock_console_print.assert_called()
+    assert result == 0
+    mock_console_print.assert_called()
 
-            # Check output contains preset names
-            output_text = " ".join(str(call) for call in mock_console_print.call_args_list)
-            assert "default" in output_text
-            assert "debug" in output_text
-            assert "hidden-preset" not in output_text
+    # The whole listing is emitted in one call; earlier calls are debug log records
+    output_text = mock_console_print.call_args[0][0]
+    assert "Configure Presets" in output_text
+    assert "default" in output_text
+    assert "debug" in output_text
+    assert "hidden-preset" not in output_text
 
 
 @CMakePresets_json(
@@ -179,16 +260,51 @@ def test_handle_list_command_tabular(mock_console_print: MagicMock) -> None:
     """Test the list command with tabular output."""
     args = argparse.Namespace(file="CMakePresets.json", directory=None, command="list", type="all", show_hidden=False, flat=False, verbose=0)
 
-    with patch("sys.argv", [__name__, "list", "--type", "all"]):
-        with patch("argparse.ArgumentParser.parse_args", return_value=args):
-            result = cli.main()
+    presets = CMakePresets("CMakePresets.json")
+    result = cli.handle_list_command(presets, args)
 
-            assert result == 0
-            mock_console_print.assert_called()
+    assert result == 0
+    mock_console_print.assert_called()
 
-            # First argument should be a table
-            table_arg = mock_console_print.call_args[0][0]
-            assert isinstance(table_arg, Table)
+    # First argument should be a table
+    table_arg = mock_console_print.call_args[0][0]
+    assert isinstance(table_arg, Table)
+
+
+@CMakePresets_json(
+    {
+        "version": 4,
+        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
+        PRESET_MAP[CONFIGURE]: [
+            {"name": "default", "generator": "Ninja"},
+            {"name": "debug", "generator": "Ninja"},
+            {"name": "hidden-preset", "generator": "Ninja", "hidden": True},
+        ],
+        PRESET_MAP[BUILD]: [
+            {"name": "default-build", "configurePreset": "default"},
+            {"name": "default-build-2", "configurePreset": "default"},
+        ],
+        PRESET_MAP[TEST]: [
+            {"name": "default-test", "configurePreset": "default"},
+        ],
+    },
+)
+def test_handle_list_command_tabular_redirected(mock_console_print: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the tabular list falls back to tab-separated lines when not writing to a terminal."""
+    mock_console_out = MagicMock()
+    monkeypatch.setattr(console, "_force_terminal", False)
+    monkeypatch.setattr(console, "out", mock_console_out)
+
+    result = cli.main(["--file", "CMakePresets.json", "list"])
+
+    assert result == 0
+    mock_console_print.assert_not_called()
+    mock_console_out.assert_called_once()
+    assert mock_console_out.call_args[0][0].splitlines() == [
+        f"{CONFIGURE}\t{BUILD}\t{TEST}",
+        "debug\t\t",
+        "default\tdefault-build,default-build-2\tdefault-test",
+    ]
 
 
 @CMakePresets_json(
@@ -215,27 +331,25 @@ def test_handle_show_command(mock_console_print: MagicMock) -> None:
         verbose=0,
     )
 
-    with patch("sys.argv", [__name__, "show", "default", "--type", CONFIGURE]):
-        with patch("argparse.ArgumentParser.parse_args", return_value=args):
-            result = cli.main()
+    presets = CMakePresets("CMakePresets.json")
+    result = cli.handle_show_command(presets, args)
 
-            assert result == 0
-            mock_console_print.assert_called()
+    assert result == 0
+    mock_console_print.assert_called()
 
-            # Reset for next test
-            mock_console_print.reset_mock()
+    # Reset for next test
+    mock_console_print.reset_mock()
 
-            # Test with JSON output
-            args.json = True
-            with patch("argparse.ArgumentParser.parse_args", return_value=args):
-                result = cli.main()
+    # Test with JSON output
+    args.json = True
+    result = cli.handle_show_command(presets, args)
 
-                assert result == 0
-                call_arg = mock_console_print.call_args[0][0]
-                parsed = json.loads(call_arg)
-                assert parsed["name"] == "default"
-                assert parsed["generator"] == "Ninja"
-                assert parsed["cacheVariables"]["CMAKE_BUILD_TYPE"] == "Debug"
+    assert result == 0
+    call_arg = mock_console_print.call_args[0][0]
+    parsed = json.loads(call_arg)
+    assert parsed["name"] == "default"
+    assert parsed["generator"] == "Ninja"
+    assert parsed["cacheVariables"]["CMAKE_BUILD_TYPE"] == "Debug"
 
 
 @CMakePresets_json(
@@ -261,16 +375,15 @@ def test_handle_show_command_not_found(mock_console_print: MagicMock) -> None:
         verbose=0,
     )
 
-    with patch("sys.argv", [__name__, "show", "nonexistent"]):
-        with patch("argparse.ArgumentParser.parse_args", return_value=args):
-            result = cli.main()
+    presets = CMakePresets("CMakePresets.json")
+    result = cli.handle_show_command(presets, args)
 
-            assert result == 1
-            mock_console_print.assert_called_once()
-            # Check error message contains preset name
-            error_msg = mock_console_print.call_args[0][0]
-            assert "nonexistent" in str(error_msg)
-            assert "Error" in str(error_msg)
+    assert result == 1
+    mock_console_print.assert_called_once()
+    # Check error message contains preset name
+    error_msg = mock_console_print.call_args[0][0]
+    assert "nonexistent" in str(error_msg)
+    assert "Error" in str(error_msg)
 
 
 @CMakePresets_json(
@@ -288,7 +401,7 @@ def test_handle_show_command_not_found(mock_console_print: MagicMock) -> None:
         ],
     },
 )
-def test_handle_related_command(mock_console_print: MagicMock) -> None:
+def test_handle_related_command(console_output: io.StringIO) -> None:
     """Test the related command."""
     args = argparse.Namespace(
         file="CMakePresets.json",
@@ -301,31 +414,26 @@ def test_handle_related_command(mock_console_print: MagicMock) -> None:
         verbose=0,
     )
 
-    with patch("sys.argv", [__name__, "related", "default", "--type", "all"]):
-        with patch("argparse.ArgumentParser.parse_args", return_value=args):
-            result = cli.main()
-
-            assert result == 0
-            mock_console_print.assert_called()
+    presets = CMakePresets("CMakePresets.json")
+    result = cli.handle_related_command(presets, args)
 
-            # Check output contains related presets
-            output_text = " ".join(str(call) for call in mock_console_print.call_args_list)
-            assert "default-build" in output_text
-            assert "default-test" in output_text
+    assert result == 0
+    # Check output contains related presets
+    output_text = console_output.getvalue()
+    assert "default-build" in output_text
+    assert "default-test" in output_text
 
-            # Reset for specific type test
-            mock_console_print.reset_mock()
+    # Reset for specific type test
+    console_output.seek(0)
+    console_output.truncate()
 
-            # Test with specific type
-            args.type = BUILD
-            with patch("sys.argv", [__name__, "related", "default", "--type", BUILD]):
-                with patch("argparse.ArgumentParser.parse_args", return_value=args):
-                    result = cli.main()
+    # Test with specific type
+    args.type = BUILD
+    result = cli.handle_related_command(presets, args)
 
-                    assert result == 0
-                    mock_console_print.assert_called()
-                    output_text = " ".join(str(call) for call in mock_console_print.call_args_list)
-                    assert "default-build" in output_text
+    assert result == 0
+    output_text = console_output.getvalue()
+    assert "default-build" in output_text
 
 
 @CMakePresets_json(
@@ -356,16 +464,15 @@ def test_handle_related_command_plain_output(mock_console_print: MagicMock) -> N
         verbose=0,
     )
 
-    with patch("sys.argv", [__name__, "related", "default", "--plain"]):
-        with patch("argparse.ArgumentParser.parse_args", return_value=args):
-            result = cli.main()
+    presets = CMakePresets("CMakePresets.json")
+    result = cli.handle_related_command(presets, args)
 
-            assert result == 0
-            mock_console_print.assert_called_once()
-            # Should print available types
-            output = mock_console_print.call_args[0][0]
-            assert BUILD in output
-            assert TEST in output
+    assert result == 0
+    mock_console_print.assert_called_once()
+    # Should print available types
+    output = mock_console_print.call_args[0][0]
+    assert BUILD in output
+    assert TEST in output
 
 
 @CMakePresets_json(
@@ -390,15 +497,14 @@ def test_handle_related_command_not_found(mock_console_print: MagicMock) -> None
         verbose=0,
     )
 
-    with patch("sys.argv", [__name__, "related", "nonexistent"]):
-        with patch("argparse.ArgumentParser.parse_args", return_value=args):
-            result = cli.main()
+    presets = CMakePresets("CMakePresets.json")
+    result = cli.handle_related_command(presets, args)
 
-            assert result == 1
-            mock_console_print.assert_called_once()
-            # Check error message contains preset name
-            error_msg = mock_console_print.call_args[0][0]
-            assert "nonexistent" in str(error_msg)
+    assert result == 1
+    mock_console_print.assert_called_once()
+    # Check error message contains preset name
+    error_msg = mock_console_print.call_args[0][0]
+    assert "nonexistent" in str(error_msg)
 
 
 @CMakePresets_json(
@@ -407,22 +513,36 @@ def test_handle_related_command_not_found(mock_console_print: MagicMock) -> None
         "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
         PRESET_MAP[CONFIGURE]: [
             {"name": "default", "generator": "Ninja"},
+            {"name": "release", "generator": "Ninja", "cacheVariables": {"CMAKE_BUILD_TYPE": "Release"}},
+        ],
+        PRESET_MAP[BUILD]: [
+            {"name": "default-build", "configurePreset": "default"},
+            {"name": "release-build", "configurePreset": "release"},
+        ],
+        PRESET_MAP[TEST]: [
+            {"name": "default-test", "configurePreset": "default"},
         ],
     },
 )
-def test_main_with_list_command(mock_console_print: MagicMock) -> None:
-    """Test the main function with list command."""
-    args = argparse.Namespace(file="CMakePresets.json", directory=None, command="list", type=CONFIGURE, show_hidden=False, flat=False, verbose=0)
-
-    with patch("sys.argv", [__name__, "list"]):
-        with patch("argparse.ArgumentParser.parse_args", return_value=args):
-            result = cli.main()
-
-            assert result == 0
-            mock_console_print.assert_called()
-            # Check output contains preset
-            output_text = " ".join(str(call) for call in mock_console_print.call_args_list)
-            assert "default" in output_text
+@pytest.mark.parametrize(
+    "argv,expected,unexpected",
+    [
+        ([], ["CMake Presets", "default", "release", "default-build", "release-build", "default-test"], []),
+        (["--flat"], ["Configure Presets", "Build Presets", "Test Presets", "default", "release-build"], []),
+        (["--type", CONFIGURE], ["Configure Presets", "default", "release"], ["Build Presets", "default-build"]),
+        (["--type", BUILD, "--flat"], ["Build Presets", "default-build", "release-build"], ["Configure Presets", "default-test"]),
+    ],
+)  # type: ignore[misc]
+def test_main_with_list_command(argv: list[str], expected: list[str], unexpected: list[str], console_output: io.StringIO) -> None:
+    """Test the list command end to end for the tabular, flat and type-filtered views."""
+    result = cli.main(["--file", "CMakePresets.json", "list", *argv])
+
+    assert result == 0
+    output_text = console_output.getvalue()
+    for text in expected:
+        assert text in output_text
+    for text in unexpected:
+        assert text not in output_text
 
 
 @CMakePresets_json(
@@ -434,21 +554,20 @@ def test_main_with_list_command(mock_console_print: MagicMock) -> None:
         ],
     },
 )
-def test_main_error_handling(mock_console_print: MagicMock) -> None:
+def test_main_error_handling(mock_console_print: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
     """Test main function error handling."""
     # Create a situation that would cause an exception
     args = argparse.Namespace(file="NonExistentFile.json", directory=None, command="list", type=CONFIGURE, show_hidden=False, flat=False, verbose=0)
 
-    with patch("sys.argv", [__name__, "--file", "NonExistentFile.json", "list"]):
-        with patch("argparse.ArgumentParser.parse_args", return_value=args):
-            result = cli.main()
+    _use_parsed_args(monkeypatch, [__name__, "--file", "NonExistentFile.json", "list"], args)
+    result = cli.main()
 
-            assert result == 1
+    assert result == 1
 
-            mock_console_print.assert_called()
-            # Check error message
-            error_msg = mock_console_print.call_args[0][0]
-            assert "Error" in str(error_msg)
+    mock_console_print.assert_called()
+    # Check error message
+    error_msg = mock_console_print.call_args[0][0]
+    assert "Error" in str(error_msg)
 
 
 @CMakePresets_json(
@@ -456,34 +575,24 @@ def test_main_error_handling(mock_console_print: MagicMock) -> None:
         "version": 4,
         "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
         PRESET_MAP[CONFIGURE]: [
-            {"name": "default", "generator": "Ninja"},
-            {"name": "release", "generator": "Ninja", "cacheVariables": {"CMAKE_BUILD_TYPE": "Release"}},
-        ],
-        PRESET_MAP[BUILD]: [
-            {"name": "default-build", "configurePreset": "default"},
-            {"name": "release-build", "configurePreset": "release"},
-        ],
-        PRESET_MAP[TEST]: [
-            {"name": "default-test", "configurePreset": "default"},
+            {
+                "name": "markup",
+                "description": "[bold]not markup[/bold] " + "long " * 40,
+                "cacheVariables": {"FLAGS": "-DVALUE=[1,2]"},
+            },
         ],
     },
 )
-def test_integration_list_command(mock_console_print: MagicMock) -> None:
-    """Integration test for list command using real file system."""
-    # Create CLI arguments
-    args = argparse.Namespace(file="CMakePresets.json", directory=None, command="list", type="all", show_hidden=False, flat=True, verbose=0)
-
-    with patch("sys.argv", [__name__, "--file", "CMakePresets.json", "list"]):
-        with patch("argparse.ArgumentParser.parse_args", return_value=args):
-            result = cli.main()
-
-            assert result == 0
-            mock_console_print.assert_called()
-
-            # Check that all presets are in the output
-            output_text = " ".join(str(call) for call in mock_console_print.call_args_list)
-            assert "default" in output_text
-            assert "release" in output_text
+def test_show_command_json_is_printed_verbatim(console_output: io.StringIO) -> None:
+    """Test that JSON output survives Rich rendering unchanged, including markup-like text and long lines."""
+    result = cli.main(["--file", "CMakePresets.json", "show", "markup", "--json"])
+
+    assert result == 0
+    assert json.loads(console_output.getvalue()) == {
+        "name": "markup",
+        "description": "[bold]not markup[/bold] " + "long " * 40,
+        "cacheVariables": {"FLAGS": "-DVALUE=[1,2]"},
+    }
 
 
 @CMakePresets_json(
@@ -496,7 +605,7 @@ def test_integration_list_command(mock_console_print: MagicMock) -> None:
         ],
     },
 )
-def test_integration_show_command(mock_console_print: MagicMock) -> None:
+def test_integration_show_command(mock_console_print: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
     """Integration test for show command using real file system."""
     # Create CLI arguments
     args = argparse.Namespace(
@@ -511,22 +620,21 @@ def test_integration_show_command(mock_console_print: MagicMock) -> None:
         verbose=0,
     )
 
-    with patch("sys.argv", [__name__, "--file", "CMakePresets.json", "show", "derived", "--json"]):
-        with patch("argparse.ArgumentParser.parse_args", return_value=args):
-            result = cli.main()
+    _use_parsed_args(monkeypatch, [__name__, "--file", "CMakePresets.json", "show", "derived", "--json"], args)
+    result = cli.main()
 
-            assert result == 0
-            mock_console_print.assert_called()
+    assert result == 0
+    mock_console_print.assert_called()
 
-            # With JSON output, we can verify the exact content
-            json_output = mock_console_print.call_args[0][0]
-            parsed = json.loads(json_output)
-            assert parsed["name"] == "derived"
-            assert "cacheVariables" in parsed
-            assert "VAR1" in parsed["cacheVariables"]
-            assert "VAR2" in parsed["cacheVariables"]
-            assert parsed["cacheVariables"]["VAR1"] == "base_value"
-            assert parsed["cacheVariables"]["VAR2"] == "derived_value"
+    # With JSON output, we can verify the exact content
+    json_output = mock_console_print.call_args[0][0]
+    parsed = json.loads(json_output)
+    assert parsed["name"] == "derived"
+    assert "cacheVariables" in parsed
+    assert "VAR1" in parsed["cacheVariables"]
+    assert "VAR2" in parsed["cacheVariables"]
+    assert parsed["cacheVariables"]["VAR1"] == "base_value"
+    assert parsed["cacheVariables"]["VAR2"] == "derived_value"
 
 
 @CMakePresets_json(
@@ -544,31 +652,26 @@ def test_integration_show_command(mock_console_print: MagicMock) -> None:
         ],
     },
 )
-def test_integration_related_command(mock_console_print: MagicMock) -> None:
-    """Integration test for related command using real file system."""
-    # Create CLI arguments
-    args = argparse.Namespace(
-        file="CMakePresets.json",
-        directory=None,
-        command="related",
-        configure_preset="default",
-        type="all",
-        show_hidden=False,
-        plain=False,
-        verbose=0,
-    )
-
-    with patch("sys.argv", [__name__, "--file", "CMakePresets.json", "related", "default"]):
-        with patch("argparse.ArgumentParser.parse_args", return_value=args):
-            result = cli.main()
-
-            assert result == 0
-            mock_console_print.assert_called()
-
-            # Check that related presets are in the output
-            output_text = " ".join(str(call) for call in mock_console_print.call_args_list)
-            assert "default-build" in output_text
-            assert "default-test" in output_text
+@pytest.mark.parametrize(
+    "argv,expected_result,expected",
+    [
+        (["related", "default"], 0, ["Presets related to configurePreset: default", "default-build", "default-test"]),
+        (["related", "default", "--type", BUILD], 0, ["buildPreset: default-build"]),
+        (["related", "default", "--plain"], 0, [f"{BUILD} {TEST}"]),
+        (["related", "missing"], 1, ["Configure preset 'missing' not found"]),
+        (["show", "default"], 0, [f"Preset: default ({CONFIGURE})", "Ninja"]),
+        (["show", "default-test"], 0, [f"Preset: default-test ({TEST})", "default"]),
+        (["show", "missing"], 1, ["Preset 'missing' not found"]),
+    ],
+)  # type: ignore[misc]
+def test_main_with_command(argv: list[str], expected_result: int, expected: list[str], console_output: io.StringIO) -> None:
+    """Test the show and related commands end to end, including their not-found errors."""
+    result = cli.main(["--file", "CMakePresets.json", *argv])
+
+    assert result == expected_result
+    output_text = console_output.getvalue()
+    for text in expected:
+        assert text in output_text
 
 
 @CMakePresets_json(
@@ -588,7 +691,7 @@ def test_integration_related_command(mock_console_print: MagicMock) -> None:
         ],
     },
 )
-def test_handle_show_command_with_resolve(mock_console_print: MagicMock) -> None:
+def test_handle_show_command_with_resolve(mock_console_print: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
     """Test the show command with macro resolution."""
     # Test with resolve option
     args = argparse.Namespace(
@@ -603,18 +706,17 @@ def test_handle_show_command_with_resolve(mock_console_print: MagicMock) -> None
         verbose=0,
     )
 
-    with patch("sys.argv", [__name__, "show", "macro-test", "--resolve", "--json"]):
-        with patch("argparse.ArgumentParser.parse_args", return_value=args):
-            result = cli.main()
+    _use_parsed_args(monkeypatch, [__name__, "show", "macro-test", "--resolve", "--json"], args)
+    result = cli.main()
 
-            # Should succeed
-            assert result == 0
-            mock_console_print.assert_called_once()
+    # Should succeed
+    assert result == 0
+    mock_console_print.assert_called_once()
 
-            # Parse the output JSON to check resolved values
-            json_output = mock_console_print.call_args[0][0]
-            parsed = json.loads(json_output)
+    # Parse the output JSON to check resolved values
+    json_output = mock_console_print.call_args[0][0]
+    parsed = json.loads(json_output)
 
-            # Check that macros were resolved
-            assert parsed["binaryDir"] == str(Path.cwd() / "build/macro-test")
-            assert parsed["cacheVariables"]["SOURCE_DIR"] == str(Path.cwd())
+    # Check that macros were resolved
+    assert parsed["binaryDir"] == str(Path.cwd() / "build/macro-test")
+    assert parsed["cacheVariables"]["SOURCE_DIR"] == str(Path.cwd())
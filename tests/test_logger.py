@@ -35,3 +35,10 @@ def test_logger_level_setting() -> None:
     # Test that child loggers inherit parent level
     child_logger = test_logger.getChild("child")
     assert child_logger.getEffectiveLevel() == ERROR
+
+
+def test_loggers_share_console() -> None:
+    """Test that loggers reuse one console per color setting instead of creating their own."""
+    assert Logger(level=DEBUG).console is console
+    assert Logger(colors=False).console is Logger(colors=False).console
+    assert Logger(colors=False).console is not console
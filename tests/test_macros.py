@@ -3,6 +3,9 @@ import platform
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
+from cmakepresets import log, logger
 from cmakepresets.constants import TEST
 from cmakepresets.macros import MacroResolver, resolve_macros_in_preset, resolve_macros_in_string
 from cmakepresets.paths import CMakeRoot
@@ -94,6 +97,17 @@ def test_vendor_macros() -> None:
     assert result.endswith("$vendor{xide.buildDir}")
 
 
+def test_plain_strings_skip_macro_substitution() -> None:
+    """Test that strings without a '$' bypass the macro pattern but still get path cleanup."""
+    resolver = MacroResolver()
+
+    with patch("cmakepresets.macros._MACRO_RE") as macro_re:
+        assert resolver.resolve_string("Ninja", {}) == "Ninja"
+        assert resolver.resolve_string("./build", {}) == "build"
+
+    macro_re.sub.assert_not_called()
+
+
 def test_resolve_in_preset() -> None:
     """Test resolving macros throughout a preset structure."""
     with patch.dict(os.environ, {"PATH": "/usr/bin", "HOME": "/home/user"}):
@@ -125,11 +139,26 @@ def test_resolve_in_preset() -> None:
         assert resolved["environment"]["NESTED"] == "source//path/to/source/bin:/usr/bin"
 
 
+def test_static_context_is_computed_once_per_resolver() -> None:
+    """Test that preset-independent macros are computed once and shared by every preset a resolver handles."""
+    resolver = MacroResolver(CMakeRoot("/path/to/source"))
+
+    with patch("cmakepresets.macros.platform.system", return_value="Linux") as system:
+        first = resolver.resolve_in_preset({"name": "first", "binaryDir": "${sourceDir}/${hostSystemName}/${presetName}"})
+        second = resolver.resolve_in_preset({"name": "second", "binaryDir": "${sourceDir}/${hostSystemName}/${presetName}"})
+
+    system.assert_called_once()
+    assert first["binaryDir"] == "/path/to/source/Linux/first"
+    assert second["binaryDir"] == "/path/to/source/Linux/second"
+
+
 def test_convenience_functions() -> None:
     """Test the module-level convenience functions."""
     # Test string resolution
     context = {"name": TEST, "value": 42}
-    assert resolve_macros_in_string("${name} has value ${value}", context) == "test has value 42"
+    with patch("cmakepresets.macros.CMakeRoot") as cmake_root:
+        assert resolve_macros_in_string("${name} has value ${value}", context) == "test has value 42"
+    cmake_root.assert_not_called()  # The string comes with its own context, so no project lookup
 
     # Test preset resolution with positional source_dir
     preset = {"name": "quick-test", "binaryDir": "${sourceDir}/build"}
@@ -162,6 +191,24 @@ def test_resolve_macros_with_empty_values() -> None:
     assert result == "None"  # None should be converted to string
 
 
+def test_resolve_nested_and_unresolvable_macros(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that nested macros resolve inside-out and unresolvable ones are returned without exhausting the depth limit."""
+    resolver = MacroResolver()
+
+    with patch.dict(os.environ, {"TOOLCHAIN_nested": "clang"}):
+        context = resolver._build_context({"name": "nested"})
+        assert resolver.resolve_string("$env{TOOLCHAIN_${presetName}}", context) == "clang"
+        assert resolver.resolve_string("${dollar}{presetName}", context) == "nested"
+
+    level = logger.level
+    logger.setLevel(log.WARNING)
+    try:
+        assert resolver.resolve_string("${nonexistent}/$env{NONEXISTENT}", {"env": {}}) == "${nonexistent}/$env{NONEXISTENT}"
+    finally:
+        logger.setLevel(level)
+    assert not any("Maximum macro resolution depth" in record.message for record in caplog.records)
+
+
 def test_host_system_name_override() -> None:
     """Test that CMAKE_HOST_SYSTEM_NAME in cacheVariables overrides hostSystemName."""
     resolver = MacroResolver()
@@ -1,4 +1,7 @@
 import os
+import threading
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from pyfakefs.fake_filesystem_unittest import Patcher
@@ -85,6 +88,56 @@ def test_parse_file_with_include() -> None:
     assert parser.loaded_files["included.json"][PRESET_MAP[CONFIGURE]][0]["name"] == "included-preset"
 
 
+@CMakePresets_json(
+    {
+        "CMakePresets.json": {
+            "version": 4,
+            "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
+            "include": ["c.json", "a.json", "b.json", "a.json"],
+        },
+        "a.json": {"version": 4, PRESET_MAP[CONFIGURE]: [{"name": "a"}]},
+        "b.json": {"version": 4, PRESET_MAP[CONFIGURE]: [{"name": "b"}]},
+        "c.json": {"version": 4, PRESET_MAP[CONFIGURE]: [{"name": "c"}]},
+    },
+)
+def test_parse_file_with_sibling_includes() -> None:
+    """Test that sibling includes are loaded once each, in include order."""
+    parser = Parser()
+    parser.parse_file("CMakePresets.json")
+
+    assert list(parser.loaded_files) == ["CMakePresets.json", "c.json", "a.json", "b.json"]
+    assert parser.processed_files == set(parser.loaded_files)
+
+
+@CMakePresets_json(
+    {
+        "CMakePresets.json": {
+            "version": 4,
+            "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
+            "include": ["a.json", "b.json"],
+        },
+        "a.json": {"version": 4, PRESET_MAP[CONFIGURE]: [{"name": "a"}]},
+        "b.json": {"version": 4, PRESET_MAP[CONFIGURE]: [{"name": "b"}]},
+    },
+)
+def test_parse_file_reads_sibling_includes_concurrently() -> None:
+    """Test that sibling includes are read at the same time rather than one after another."""
+    # Both include reads must be in flight together for the barrier to release
+    barrier = threading.Barrier(2, timeout=5)
+    read_file = Parser._read_file
+
+    def read_file_in_step(parser: Parser, filepath: Path) -> bytes:
+        if filepath.name != "CMakePresets.json":
+            barrier.wait()
+        return read_file(parser, filepath)
+
+    with patch.object(Parser, "_read_file", autospec=True, side_effect=read_file_in_step):
+        parser = Parser()
+        parser.parse_file("CMakePresets.json")
+
+    assert list(parser.loaded_files) == ["CMakePresets.json", "a.json", "b.json"]
+
+
 @CMakePresets_json(
     {
         "CMakePresets.json": {"version": 4, "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0}, "include": ["level1/second.json"]},
@@ -108,6 +161,22 @@ def test_parse_file_with_multi_level_includes() -> None:
     assert parser.loaded_files["level2/third.json"][PRESET_MAP[CONFIGURE]][0]["name"] == "deep-preset"
 
 
+@CMakePresets_json(
+    {
+        "CMakePresets.json": {"version": 4, "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0}, "include": ["only.json"]},
+        "only.json": {"version": 4, PRESET_MAP[CONFIGURE]: [{"name": "only"}]},
+    },
+)
+def test_parse_file_reads_single_include_without_threads() -> None:
+    """Test that a lone include is read directly instead of through a thread pool."""
+    with patch("cmakepresets.parser.ThreadPoolExecutor") as executor:
+        parser = Parser()
+        parser.parse_file("CMakePresets.json")
+
+    executor.assert_not_called()
+    assert list(parser.loaded_files) == ["CMakePresets.json", "only.json"]
+
+
 @CMakePresets_json(
     {
         "project/CMakePresets.json": {"version": 4, "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0}, "include": ["configs/dev.json"]},
@@ -221,6 +290,18 @@ def test_parser_invalid_json(fs_patcher: pytest.FixtureRequest) -> None:
         parser.parse_file("CMakePresets.json")
 
 
+def test_parser_reads_bom_and_rejects_undecodable_bytes(fs_patcher: pytest.FixtureRequest) -> None:
+    """Test that a UTF-8 BOM is accepted and undecodable bytes surface as a parse error"""
+    fs_patcher.fs.create_file("CMakePresets.json", contents=b'\xef\xbb\xbf{"version": 2, "cmakeMinimumRequired": {"major": 3, "minor": 20, "patch": 0}}')
+    parser = Parser()
+    parser.parse_file("CMakePresets.json")
+    assert parser.loaded_files["CMakePresets.json"]["version"] == 2
+
+    fs_patcher.fs.create_file("broken/CMakePresets.json", contents=b'{"version": "\xff"}')
+    with pytest.raises(FileParseError, match="Unable to decode"):
+        Parser().parse_file("broken/CMakePresets.json")
+
+
 @CMakePresets_json(
     {
         "CMakePresets.json": {"version": 4, "include": ["file1.json"]},
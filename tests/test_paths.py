@@ -61,6 +61,9 @@ def test_relative_path_methods() -> None:
     # Test get_relative_path
     assert root.get_relative_path(Path("/home/user/project/src/main.cpp")) == "src/main.cpp"
     assert root.get_relative_path(Path("/other/path/file.txt")) == "/other/path/file.txt"
+    assert root.get_relative_path(Path("/home/user/project-other/file.txt")) == "/home/user/project-other/file.txt"
+    assert root.get_relative_path(Path("/home/user/project")) == "."
+    assert CMakeRoot("/").get_relative_path(Path("/etc/presets.json")) == "etc/presets.json"
 
 
 @CMakePresets_json()
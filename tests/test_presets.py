@@ -2,7 +2,11 @@ import os
 import platform
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
+import pytest
+
+from cmakepresets import log, logger
 from cmakepresets.constants import BUILD, CONFIGURE, PACKAGE, PRESET_MAP, TEST, WORKFLOW
 from cmakepresets.paths import CMakeRoot
 from cmakepresets.presets import CMakePresets
@@ -27,112 +31,52 @@ def test_initialize_with_directory_path() -> None:
 
 @CMakePresets_json(
     {
-        "version": 4,
+        "version": 6,
         "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
         PRESET_MAP[CONFIGURE]: [
             {"name": "default", "generator": "Ninja"},
             {"name": "debug", "generator": "Ninja", "binaryDir": "${sourceDir}/build/debug"},
         ],
-    },
-)
-def test_get_configure_presets() -> None:
-    """Test retrieving configure presets."""
-    presets = CMakePresets("CMakePresets.json")
-    configure_presets = presets.get_configure_presets()
-    assert len(configure_presets) == 2
-    assert configure_presets[0]["name"] == "default"
-    assert configure_presets[1]["name"] == "debug"
-
-    # Test the property accessor too
-    assert presets.configure_presets == configure_presets
-
-
-@CMakePresets_json(
-    {
-        "version": 4,
-        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
         PRESET_MAP[BUILD]: [
-            {"name": "release-build", "configurePreset": "release"},
+            {"name": "release-build", "configurePreset": "default"},
             {"name": "debug-build", "configurePreset": "debug"},
         ],
-    },
-)
-def test_get_build_presets() -> None:
-    """Test retrieving build presets."""
-    presets = CMakePresets("CMakePresets.json")
-    build_presets = presets.get_build_presets()
-    assert len(build_presets) == 2
-    assert build_presets[0]["name"] == "release-build"
-    assert build_presets[1]["name"] == "debug-build"
-
-    # Test the property accessor too
-    assert presets.build_presets == build_presets
-
-
-@CMakePresets_json(
-    {
-        "version": 4,
-        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
         PRESET_MAP[TEST]: [
             {"name": "unit-tests", "configurePreset": "debug"},
-            {"name": "integration-tests", "configurePreset": "release"},
+            {"name": "integration-tests", "configurePreset": "default"},
         ],
-    },
-)
-def test_get_test_presets() -> None:
-    """Test retrieving test presets."""
-    presets = CMakePresets("CMakePresets.json")
-    test_presets = presets.get_test_presets()
-    assert len(test_presets) == 2
-    assert test_presets[0]["name"] == "unit-tests"
-    assert test_presets[1]["name"] == "integration-tests"
-
-    # Test the property accessor too
-    assert presets.test_presets == test_presets
-
-
-@CMakePresets_json(
-    {
-        "version": 6,
-        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
         PRESET_MAP[PACKAGE]: [
-            {"name": "deb-package", "configurePreset": "release"},
-            {"name": "rpm-package", "configurePreset": "release"},
+            {"name": "deb-package", "configurePreset": "default"},
+            {"name": "rpm-package", "configurePreset": "default"},
         ],
-    },
-)
-def test_get_package_presets() -> None:
-    """Test retrieving package presets."""
-    presets = CMakePresets("CMakePresets.json")
-    package_presets = presets.get_package_presets()
-    assert len(package_presets) == 2
-    assert package_presets[0]["name"] == "deb-package"
-    assert package_presets[1]["name"] == "rpm-package"
-
-    # Test the property accessor too
-    assert presets.package_presets == package_presets
-
-
-@CMakePresets_json(
-    {
-        "version": 6,
-        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
         PRESET_MAP[WORKFLOW]: [
             {"name": "ci-workflow", "steps": [{"type": "configure", "name": "default"}]},
-            {"name": "release-workflow", "steps": [{"type": "configure", "name": "release"}]},
+            {"name": "release-workflow", "steps": [{"type": "configure", "name": "debug"}]},
         ],
     },
 )
-def test_get_workflow_presets() -> None:
-    """Test retrieving workflow presets."""
+@pytest.mark.parametrize(
+    "preset_type,expected_names",
+    [
+        (CONFIGURE, ["default", "debug"]),
+        (BUILD, ["release-build", "debug-build"]),
+        (TEST, ["unit-tests", "integration-tests"]),
+        (PACKAGE, ["deb-package", "rpm-package"]),
+        (WORKFLOW, ["ci-workflow", "release-workflow"]),
+    ],
+)  # type: ignore[misc]
+def test_get_presets_of_type(preset_type: str, expected_names: list[str]) -> None:
+    """Test retrieving the presets of each type through the getter and the property accessor."""
     presets = CMakePresets("CMakePresets.json")
-    workflow_presets = presets.get_workflow_presets()
-    assert len(workflow_presets) == 2
-    assert workflow_presets[0]["name"] == "ci-workflow"
-    assert workflow_presets[1]["name"] == "release-workflow"
+    type_presets = getattr(presets, f"get_{preset_type}_presets")()
+    assert [preset["name"] for preset in type_presets] == expected_names
 
     # Test the property accessor too
-    assert presets.workflow_presets == workflow_presets
+    assert getattr(presets, f"{preset_type}_presets") == type_presets
+
+    # Each call hands out its own list
+    type_presets.clear()
+    assert [preset["name"] for preset in getattr(presets, f"get_{preset_type}_presets")()] == expected_names
 
 
 @CMakePresets_json(
@@ -186,6 +130,29 @@ def test_find_preset() -> None:
     assert nonexistent is None
 
 
+@CMakePresets_json(
+    {
+        "version": 4,
+        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
+        PRESET_MAP[CONFIGURE]: [{"name": "default", "generator": "Ninja"}],
+        PRESET_MAP[BUILD]: [{"name": "default-build", "configurePreset": "default"}],
+    },
+)
+def test_preset_lookups_share_one_index() -> None:
+    """Test that name lookups build the preset index once and reuse it."""
+    presets = CMakePresets("CMakePresets.json")
+
+    with patch.object(presets, "_iter_presets_of_type", wraps=presets._iter_presets_of_type) as iter_presets:
+        for _ in range(3):
+            assert presets.get_preset_by_name(CONFIGURE, "default") is not None
+            assert presets.get_preset_by_name(BUILD, "default-build") is not None
+            assert presets.get_preset_by_name(TEST, "default") is None
+            assert presets.find_preset("default-build") is not None
+
+    # One scan per preset type while building the index, none afterwards
+    assert iter_presets.call_count == len(PRESET_MAP)
+
+
 @CMakePresets_json(
     {
         "CMakePresets.json": {
@@ -208,13 +175,14 @@ def test_presets_with_includes() -> None:
     # Should have presets from both files
     configure_presets = presets.get_configure_presets()
     assert len(configure_presets) == 2
-    assert any(preset["name"] == "base" for preset in configure_presets)
-    assert any(preset["name"] == "nested" for preset in configure_presets)
+    assert presets.configure_preset_names == {"base", "nested"}
 
     # Should have build presets from the included file
     build_presets = presets.get_build_presets()
     assert len(build_presets) == 1
     assert build_presets[0]["name"] == "nested-build"
+    assert "nested-build" in presets.build_preset_names
+    assert not presets.test_preset_names
 
 
 @CMakePresets_json(
@@ -237,8 +205,7 @@ def test_user_presets_are_included() -> None:
     # Should have presets from both files
     configure_presets = presets.get_configure_presets()
     assert len(configure_presets) == 2
-    assert any(preset["name"] == "base" for preset in configure_presets)
-    assert any(preset["name"] == "user" for preset in configure_presets)
+    assert presets.configure_preset_names == {"base", "user"}
 
 
 @CMakePresets_json(
@@ -273,6 +240,55 @@ def test_get_preset_inheritance_chain() -> None:
     assert len(chain) == 0
 
 
+@CMakePresets_json(
+    {
+        "version": 4,
+        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
+        PRESET_MAP[CONFIGURE]: [
+            {"name": "first", "inherits": "second", "generator": "Ninja"},
+            {"name": "second", "inherits": "first"},
+        ],
+    },
+)
+def test_get_preset_inheritance_chain_cycle(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that an inheritance cycle terminates without listing a preset as its own ancestor."""
+    presets = CMakePresets("CMakePresets.json")
+
+    level = logger.level
+    logger.setLevel(log.WARNING)
+    try:
+        chain = presets.get_preset_inheritance_chain(CONFIGURE, "first")
+    finally:
+        logger.setLevel(level)
+    assert [preset["name"] for preset in chain] == ["second"]
+    assert any("Inheritance cycle detected at preset 'first'" in record.message for record in caplog.records)
+
+
+@CMakePresets_json(
+    {
+        "version": 4,
+        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
+        PRESET_MAP[CONFIGURE]: [
+            {"name": "base", "generator": "Ninja"},
+            {"name": "debug", "inherits": "base"},
+            {"name": "extended", "inherits": "debug"},
+        ],
+    },
+)
+def test_get_preset_inheritance_chain_is_memoized() -> None:
+    """Test that inheritance chains are resolved once per preset and returned as independent lists."""
+    presets = CMakePresets("CMakePresets.json")
+
+    with patch.object(presets, "_collect_inheritance_chain", wraps=presets._collect_inheritance_chain) as collect:
+        first = presets.get_preset_inheritance_chain(CONFIGURE, "extended")
+        calls = collect.call_count
+        first.append({"name": "appended"})
+        second = presets.get_preset_inheritance_chain(CONFIGURE, "extended")
+
+    assert collect.call_count == calls
+    assert [preset["name"] for preset in second] == ["base", "debug"]
+
+
 @CMakePresets_json(
     {
         "version": 4,
@@ -301,6 +317,32 @@ def test_flatten_preset() -> None:
     assert "inherits" not in flattened
 
 
+@CMakePresets_json(
+    {
+        "version": 4,
+        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
+        PRESET_MAP[CONFIGURE]: [
+            {"name": "base", "generator": "Ninja", "cacheVariables": {"VAR1": "base_value"}},
+            {"name": "debug", "inherits": "base", "cacheVariables": {"VAR2": "debug_value"}},
+        ],
+    },
+)
+def test_flatten_preset_is_memoized() -> None:
+    """Test that repeated flattening reuses the merged preset but hands out independent copies."""
+    presets = CMakePresets("CMakePresets.json")
+
+    with patch.object(presets, "_flatten_uncached", wraps=presets._flatten_uncached) as flatten_uncached:
+        first = presets.flatten_preset(CONFIGURE, "debug")
+        first["cacheVariables"]["VAR1"] = "changed"
+        first["generator"] = "Make"
+
+        second = presets.flatten_preset(CONFIGURE, "debug")
+
+    flatten_uncached.assert_called_once_with(CONFIGURE, "debug")
+    assert second["generator"] == "Ninja"
+    assert second["cacheVariables"] == {"VAR1": "base_value", "VAR2": "debug_value"}
+
+
 @CMakePresets_json(
     {
         "version": 4,
@@ -330,6 +372,23 @@ def test_get_dependent_presets() -> None:
     assert dependents[PRESET_MAP[TEST]][0]["name"] == "base-test"
 
 
+@CMakePresets_json(
+    {
+        "version": 4,
+        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
+        PRESET_MAP[CONFIGURE]: [{"name": "base", "generator": "Ninja"}],
+        PRESET_MAP[BUILD]: [{"name": "base-build", "configurePreset": "base"}],
+    },
+)
+def test_get_dependent_presets_non_configure() -> None:
+    """Test that non-configure presets report no dependents."""
+    presets = CMakePresets("CMakePresets.json")
+
+    dependents = presets.get_dependent_presets(BUILD, "base-build")
+    assert set(dependents) == set(PRESET_MAP.values())
+    assert all(len(deps) == 0 for deps in dependents.values())
+
+
 @CMakePresets_json(
     {
         "version": 4,
@@ -370,6 +429,62 @@ def test_get_dependent_presets_with_inheritance() -> None:
     assert "inherited-test" in test_names
 
 
+@CMakePresets_json(
+    {
+        "version": 4,
+        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
+        PRESET_MAP[CONFIGURE]: [
+            {"name": "base", "generator": "Ninja"},
+            {"name": "single", "inherits": "base"},
+            {"name": "multiple", "inherits": ["single", "base"]},
+        ],
+        PRESET_MAP[BUILD]: [{"name": "build", "configurePreset": "base"}],
+    },
+)
+def test_preset_references_are_interned() -> None:
+    """Test that preset names and the names referring to them share one string object."""
+    presets = CMakePresets("CMakePresets.json")
+    base, single, multiple = presets.configure_presets
+
+    assert single["inherits"] is base["name"]
+    assert multiple["inherits"][0] is single["name"]
+    assert multiple["inherits"][1] is base["name"]
+    assert presets.build_presets[0]["configurePreset"] is base["name"]
+
+
+@CMakePresets_json(
+    {
+        "version": 4,
+        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
+        PRESET_MAP[CONFIGURE]: [
+            {"name": "base", "generator": "Ninja"},
+            {"name": "other", "generator": "Ninja"},
+        ],
+        PRESET_MAP[BUILD]: [
+            {"name": "base-build", "configurePreset": "base"},
+            {"name": "other-build", "configurePreset": "other"},
+        ],
+    },
+)
+def test_get_dependent_presets_scans_once() -> None:
+    """Test that dependents of every configure preset come from a single scan of the dependent presets."""
+    presets = CMakePresets("CMakePresets.json")
+
+    with patch.object(presets, "_iter_presets_of_type", wraps=presets._iter_presets_of_type) as iter_presets:
+        base = presets.get_dependent_presets(CONFIGURE, "base")
+        calls = iter_presets.call_count
+        # Results are copies, so mutating one must not change later results
+        base[PRESET_MAP[BUILD]].clear()
+        other = presets.get_dependent_presets(CONFIGURE, "other")
+        unknown = presets.get_dependent_presets(CONFIGURE, "unknown")
+
+    assert iter_presets.call_count == calls
+    assert [preset["name"] for preset in presets.get_dependent_presets(CONFIGURE, "base")[PRESET_MAP[BUILD]]] == ["base-build"]
+    assert [preset["name"] for preset in other[PRESET_MAP[BUILD]]] == ["other-build"]
+    assert set(unknown) == set(PRESET_MAP.values())
+    assert all(len(deps) == 0 for deps in unknown.values())
+
+
 @CMakePresets_json(
     {
         "version": 4,
@@ -459,6 +574,57 @@ def test_find_related_presets() -> None:
     assert nonexistent_related is None
 
 
+@CMakePresets_json(
+    {
+        "version": 4,
+        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
+        PRESET_MAP[CONFIGURE]: [{"name": "base", "generator": "Ninja"}],
+        PRESET_MAP[BUILD]: [{"name": "base-build", "configurePreset": "base"}],
+    },
+)
+def test_preset_tree_is_built_once() -> None:
+    """Test that related preset lookups reuse the preset tree."""
+    presets = CMakePresets("CMakePresets.json")
+
+    with patch.object(presets, "_build_tree", wraps=presets._build_tree) as build_tree:
+        first = presets.find_related_presets("base", BUILD)
+        second = presets.find_related_presets("base", BUILD)
+        tree = presets.get_preset_tree()
+
+    build_tree.assert_called_once()
+    assert first == second == {BUILD: [{"name": "base-build", "configurePreset": "base"}]}
+    assert tree == presets.get_preset_tree()
+
+
+@CMakePresets_json(
+    {
+        "version": 4,
+        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
+        PRESET_MAP[CONFIGURE]: [{"name": "base", "generator": "Ninja"}],
+        PRESET_MAP[BUILD]: [{"name": "base-build", "configurePreset": "base"}],
+    },
+)
+def test_preset_tree_results_are_independent() -> None:
+    """Test that changing a returned tree or related preset list leaves later lookups unchanged."""
+    presets = CMakePresets("CMakePresets.json")
+    expected_build = [{"name": "base-build", "configurePreset": "base"}]
+
+    related = presets.find_related_presets("base")
+    assert related is not None
+    related[BUILD].append({"name": "bogus"})
+    filtered = presets.find_related_presets("base", BUILD)
+    assert filtered is not None
+    filtered[BUILD].clear()
+
+    tree = presets.get_preset_tree()
+    tree["base"]["dependents"][PRESET_MAP[BUILD]].append({"name": "bogus"})
+    tree.clear()
+
+    assert presets.find_related_presets("base") == {BUILD: expected_build, TEST: [], PACKAGE: []}
+    assert presets.find_related_presets("base", BUILD) == {BUILD: expected_build}
+    assert presets.get_preset_tree()["base"]["dependents"][PRESET_MAP[BUILD]] == expected_build
+
+
 @CMakePresets_json(
     {
         "version": 6,
@@ -574,6 +740,29 @@ def test_resolve_vendor_macro_values() -> None:
     assert resolved["cacheVariables"]["VENDOR_VAR"] == "$vendor{xide.customValue}"
 
 
+@CMakePresets_json(
+    {
+        "version": 4,
+        "cmakeMinimumRequired": {"major": 3, "minor": 23, "patch": 0},
+        PRESET_MAP[CONFIGURE]: [
+            {"name": "first", "binaryDir": "${sourceDir}/${hostSystemName}/${presetName}"},
+            {"name": "second", "binaryDir": "${sourceDir}/${hostSystemName}/${presetName}"},
+        ],
+    },
+)
+def test_resolve_macro_values_shares_resolver() -> None:
+    """Test that resolving several presets computes the built-in macros only once."""
+    presets = CMakePresets("CMakePresets.json")
+
+    with patch("cmakepresets.macros.platform.system", return_value="Linux") as system:
+        first = presets.resolve_macro_values(CONFIGURE, "first")
+        second = presets.resolve_macro_values(CONFIGURE, "second")
+
+    system.assert_called_once()
+    assert first["binaryDir"] == "/home/user/project/Linux/first"
+    assert second["binaryDir"] == "/home/user/project/Linux/second"
+
+
 @CMakePresets_json(
     {
         "version": 4,
@@ -598,5 +787,12 @@ def test_merge_presets_chain() -> None:
     assert merged["cacheVariables"] == {"DEBUG": "ON"}
     assert merged["hidden"] is False  # Should use the last one in chain
 
+    # Nested dicts are merged into copies, leaving the chain untouched
+    chain[0]["cacheVariables"] = {"BASE": "ON", "DEBUG": "OFF"}
+    merged = presets._merge_presets_chain(chain, non_inheritable_properties=["hidden"])
+    assert merged["cacheVariables"] == {"BASE": "ON", "DEBUG": "ON"}
+    assert chain[0]["cacheVariables"] == {"BASE": "ON", "DEBUG": "OFF"}
+    assert chain[1]["cacheVariables"] == {"DEBUG": "ON"}
+
     # Test merging with empty chain
     assert presets._merge_presets_chain([], []) == {}
@@ -1,48 +1,85 @@
-from typing import Any, cast
+import functools
+import json
+import subprocess
+import sys
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
 
 import jsonschema
 import jsonschema.exceptions
 import pytest
+from pyfakefs.fake_filesystem import FakeFilesystem
 
 from cmakepresets import log, logger
-from cmakepresets.constants import BUILD, CONFIGURE, PACKAGE, PRESET_MAP, TEST, WORKFLOW
+from cmakepresets import schema as schema_mod
+from cmakepresets.constants import BUILD_KEY, CONFIGURE_KEY, PACKAGE_KEY, TEST, TEST_KEY, WORKFLOW_KEY
 from cmakepresets.exceptions import VersionError
-from cmakepresets.schema import check_cmake_version_for_schema, get_schema, schema_has_version, validate_json_against_schema
-
-
-def test_get_schema() -> None:
-    def in_schema(version: int, key: str, schema: dict[str, Any]) -> bool:
-        if "oneOf" in schema:
-            for variant in schema.get("oneOf", []):
-                if "properties" in variant and variant["properties"].get("version", {}).get("const") == version and key in variant["properties"]:
-                    return True
-        return False
-
-    version = 2
-    schema = get_schema(version)
-    assert in_schema(version, PRESET_MAP[CONFIGURE], schema)
-    assert in_schema(version, PRESET_MAP[BUILD], schema)
-    assert in_schema(version, PRESET_MAP[TEST], schema)
-    assert not in_schema(version, PRESET_MAP[PACKAGE], schema)
-    assert not in_schema(version, PRESET_MAP[WORKFLOW], schema)
-
-    version = 6
-    schema = get_schema(version)
-    assert in_schema(version, PRESET_MAP[PACKAGE], schema)
-    assert in_schema(version, PRESET_MAP[WORKFLOW], schema)
-
-    version = 10
-    schema = get_schema(version)
-    assert in_schema(version, PRESET_MAP[CONFIGURE], schema)
-    assert in_schema(version, PRESET_MAP[BUILD], schema)
-    assert in_schema(version, PRESET_MAP[TEST], schema)
-    assert in_schema(version, PRESET_MAP[PACKAGE], schema)
-    assert in_schema(version, PRESET_MAP[WORKFLOW], schema)
+from cmakepresets.schema import (
+    _get_document_key,
+    _get_latest_master_schema,
+    _get_validated_documents,
+    _get_validator,
+    _get_variant_version,
+    _get_version_validators,
+    check_cmake_version_for_schema,
+    get_latest_master_schema,
+    get_schema,
+    schema_has_version,
+    validate_json_against_schema,
+)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def warning_level() -> Iterator[None]:
+    """Let warnings through to caplog for the tests in this module, restoring the package log level afterwards."""
+    level = logger.level
+    logger.setLevel(log.WARNING)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+
+
+@pytest.fixture(scope="module")
+def schema_for() -> Callable[[int], dict[str, Any]]:
+    """Get schemas by version, loading each version at most once for the tests in this module."""
+    return functools.cache(get_schema)
+
+
+def _log_text(caplog: pytest.LogCaptureFixture) -> str:
+    """Join the captured log messages so several expected substrings can be checked against one string."""
+    return "\n".join(caplog.messages)
+
+
+def _variant_fields(schema: dict[str, Any], version: int) -> set[str]:
+    """Collect the top-level fields the schema allows for documents of a version, in one pass over its variants."""
+    fields: set[str] = set()
+    for variant in schema.get("oneOf", []):
+        if _get_variant_version(variant) == version:
+            fields.update(variant["properties"])
+    return fields
+
+
+@pytest.mark.parametrize(
+    "version,present,absent",
+    [
+        (2, [CONFIGURE_KEY, BUILD_KEY, TEST_KEY], [PACKAGE_KEY, WORKFLOW_KEY]),
+        (6, [CONFIGURE_KEY, BUILD_KEY, TEST_KEY, PACKAGE_KEY, WORKFLOW_KEY], []),
+        (10, [CONFIGURE_KEY, BUILD_KEY, TEST_KEY, PACKAGE_KEY, WORKFLOW_KEY], []),
+    ],
+)  # type: ignore
+def test_get_schema(version: int, present: list[str], absent: list[str], schema_for: Callable[[int], dict[str, Any]]) -> None:
+    fields = _variant_fields(schema_for(version), version)
+    for field in present:
+        assert field in fields
+    for field in absent:
+        assert field not in fields
 
 
 @pytest.mark.parametrize("version,expected", [(2, True), (10, True), (100, False)])  # type: ignore
-def test_schema_versions(version: int, expected: bool) -> None:
-    schema = get_schema(version if expected else 10)
+def test_schema_versions(version: int, expected: bool, schema_for: Callable[[int], dict[str, Any]]) -> None:
+    schema = schema_for(version if expected else 10)
     assert schema_has_version(schema, version) is expected
 
 
@@ -52,59 +89,52 @@ def test_schema_versions(version: int, expected: bool) -> None:
         (
             2,
             [
-                PRESET_MAP[CONFIGURE],
-                PRESET_MAP[BUILD],
+                CONFIGURE_KEY,
+                BUILD_KEY,
             ],
         ),
         (
             4,
             [
-                PRESET_MAP[CONFIGURE],
-                PRESET_MAP[BUILD],
-                PRESET_MAP[TEST],
-                "!" + PRESET_MAP[PACKAGE],
-                "!" + PRESET_MAP[WORKFLOW],
+                CONFIGURE_KEY,
+                BUILD_KEY,
+                TEST_KEY,
+                "!" + PACKAGE_KEY,
+                "!" + WORKFLOW_KEY,
             ],
         ),
         (
             6,
             [
-                PRESET_MAP[CONFIGURE],
-                PRESET_MAP[BUILD],
-                PRESET_MAP[TEST],
-                PRESET_MAP[PACKAGE],
-                PRESET_MAP[WORKFLOW],
+                CONFIGURE_KEY,
+                BUILD_KEY,
+                TEST_KEY,
+                PACKAGE_KEY,
+                WORKFLOW_KEY,
             ],
         ),
         (
             10,
             [
-                PRESET_MAP[CONFIGURE],
-                PRESET_MAP[BUILD],
-                PRESET_MAP[TEST],
-                PRESET_MAP[PACKAGE],
-                PRESET_MAP[WORKFLOW],
+                CONFIGURE_KEY,
+                BUILD_KEY,
+                TEST_KEY,
+                PACKAGE_KEY,
+                WORKFLOW_KEY,
             ],
         ),
     ],
 )  # type: ignore
-def test_schema_version_fields(version: int, expected_fields: list[str]) -> None:
+def test_schema_version_fields(version: int, expected_fields: list[str], schema_for: Callable[[int], dict[str, Any]]) -> None:
     """Test that schemas for different versions contain expected fields."""
-    schema = get_schema(version)
-
-    def field_in_schema(field: str) -> bool:
-        for variant in schema.get("oneOf", []):
-            if "properties" in variant and variant["properties"].get("version", {}).get("const") == version:
-                if field in variant.get("properties", {}):
-                    return True
-        return False
+    fields = _variant_fields(schema_for(version), version)
 
     for field in expected_fields:
         if field.startswith("!"):
             actual_field = field[1:]
-            assert not field_in_schema(actual_field), f"Field {actual_field} should NOT be in schema version {version}"
+            assert actual_field not in fields, f"Field {actual_field} should NOT be in schema version {version}"
         else:
-            assert field_in_schema(field), f"Field {field} should be in schema version {version}"
+            assert field in fields, f"Field {field} should be in schema version {version}"
 
 
 def test_schema_getter() -> None:
@@ -114,8 +144,8 @@ def test_schema_getter() -> None:
     get_schema(10000)
 
 
-def test_validate_json_against_schema() -> None:
-    schema_v10 = get_schema(10)
+def test_validate_json_against_schema(schema_for: Callable[[int], dict[str, Any]]) -> None:
+    schema_v10 = schema_for(10)
 
     validate_json_against_schema({"version": 4}, schema_v10)
 
@@ -128,9 +158,9 @@ def test_validate_json_against_schema() -> None:
     validate_json_against_schema({"version": 10000}, schema_v10)
 
 
-def test_validate_include_field_version_compatibility() -> None:
+def test_validate_include_field_version_compatibility(schema_for: Callable[[int], dict[str, Any]]) -> None:
     """Test that using include field with incompatible version gives clear error."""
-    schema = get_schema(4)  # Get schema that supports version 4 which allows include field
+    schema = schema_for(4)  # Get schema that supports version 4 which allows include field
 
     valid_data = {"version": 4, "cmakeMinimumRequired": {"major": 3, "minor": 20, "patch": 0}, "include": ["included.json"]}
     validate_json_against_schema(valid_data, schema)  # Should not raise
@@ -144,11 +174,11 @@ def test_validate_include_field_version_compatibility() -> None:
     assert "version 4" in str(exc_info.value)
 
 
-def test_validate_testpresets_field_version_compatibility() -> None:
+def test_validate_testpresets_field_version_compatibility(schema_for: Callable[[int], dict[str, Any]]) -> None:
     """Test that using testPresets field with incompatible version gives clear error."""
-    schema = get_schema(3)  # Get schema that supports version 3
+    schema = schema_for(3)  # Get schema that supports version 3
 
-    valid_data = {"version": 3, "cmakeMinimumRequired": {"major": 3, "minor": 20, "patch": 0}, PRESET_MAP[TEST]: [{"name": TEST}]}
+    valid_data = {"version": 3, "cmakeMinimumRequired": {"major": 3, "minor": 20, "patch": 0}, TEST_KEY: [{"name": TEST}]}
     validate_json_against_schema(valid_data, schema)  # Should not raise
 
     invalid_data = {"version": 2, "cmakeMinimumRequired": {"major": 3, "minor": 20, "patch": 0}, "include": []}
@@ -157,11 +187,9 @@ def test_validate_testpresets_field_version_compatibility() -> None:
         validate_json_against_schema(invalid_data, schema)
 
 
-def test_validate_future_version_compatibility(caplog: pytest.LogCaptureFixture) -> None:
+def test_validate_future_version_compatibility(caplog: pytest.LogCaptureFixture, schema_for: Callable[[int], dict[str, Any]]) -> None:
     """Test that using a future version is handled gracefully and logs appropriately."""
-    logger.setLevel(log.WARNING)
-
-    schema = get_schema(10)  # Latest version we support
+    schema = schema_for(10)  # Latest version we support
 
     future_data = {
         "version": 11,
@@ -170,41 +198,169 @@ def test_validate_future_version_compatibility(caplog: pytest.LogCaptureFixture)
 
     validate_json_against_schema(future_data, schema)
 
-    assert any("version 11" in record.message for record in caplog.records)
-    assert any("validating against version" in record.message.lower() for record in caplog.records)
+    messages = _log_text(caplog)
+    assert "version 11" in messages
+    assert "validating against version" in messages.lower()
 
 
 def test_check_cmake_version_for_schema_warning(caplog: pytest.LogCaptureFixture) -> None:
     """Test that warning is logged when schema version requires higher CMake version than provided."""
-    logger.setLevel(log.WARNING)
-
     schema_version = 7
     cmake_min_required = {"major": 3, "minor": 26, "patch": 0}  # Too low for schema version 7
 
     check_cmake_version_for_schema(schema_version, cmake_min_required)
 
-    assert any("requires CMake 3.27.0" in record.message for record in caplog.records)
-    assert any("but cmakeMinimumRequired is set to 3.26.0" in record.message for record in caplog.records)
+    messages = _log_text(caplog)
+    assert "requires CMake 3.27.0" in messages
+    assert "but cmakeMinimumRequired is set to 3.26.0" in messages
 
 
 def test_check_cmake_version_unknown_schema(caplog: pytest.LogCaptureFixture) -> None:
     """Test that warning is logged when schema version is unknown."""
-    logger.setLevel(log.WARNING)
-
     schema_version = 999
     cmake_min_required = {"major": 3, "minor": 30, "patch": 0}
 
     check_cmake_version_for_schema(schema_version, cmake_min_required)
 
-    assert any("Unknown schema version: 999" in record.message for record in caplog.records)
+    assert "Unknown schema version: 999" in _log_text(caplog)
 
 
 def test_schema_validation_with_invalid_schema() -> None:
     """Test schema validation with invalid inputs"""
-    # Test validating against non-existent schema
+    # Test with a schema keyword holding a value of the wrong type
     with pytest.raises(jsonschema.exceptions.SchemaError):
-        validate_json_against_schema({}, cast(dict[str, Any], {"nonexistent_schema"}))
+        validate_json_against_schema({}, {"type": 42})
 
     # Test with malformed schema
-    with pytest.raises(Exception):
-        validate_json_against_schema({}, cast(dict[str, Any], {"malformed_schena"}))
+    with pytest.raises(jsonschema.exceptions.SchemaError):
+        validate_json_against_schema({}, {"required": "version"})
+
+
+def test_validator_is_cached_per_schema() -> None:
+    """Test that the compiled validator is reused for the same schema, even when loaded separately."""
+    schema = {"title": "cached validator", "type": "object", "properties": {"version": {"type": "integer"}}}
+
+    assert _get_validator(schema) is _get_validator(schema)
+    assert _get_validator(schema) is _get_validator(json.loads(json.dumps(schema)))
+    assert _get_validator(schema) is not _get_validator({**schema, "title": "other validator"})
+
+    validate_json_against_schema({"version": 4}, schema)
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        validate_json_against_schema({"version": "4"}, schema)
+
+
+def test_loaded_schemas_skip_meta_validation(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that schemas loaded for a document's version are not checked against the meta-schema, unlike given ones."""
+    checked: list[dict[str, Any]] = []
+    version_schema = {"type": "object", "properties": {"version": {"const": 5}}}
+    validator_cls = jsonschema.validators.validator_for(version_schema)
+
+    monkeypatch.setattr(schema_mod, "get_schema", lambda version: version_schema)
+    monkeypatch.setattr(validator_cls, "check_schema", classmethod(lambda cls, schema, **kwargs: checked.append(schema)))
+    schema_mod._get_schema_for_version.cache_clear()
+    try:
+        validate_json_against_schema({"version": 5})
+        assert checked == []
+
+        given_schema = {**version_schema, "title": "given"}
+        validate_json_against_schema({"version": 5}, given_schema)
+        assert checked == [given_schema]
+    finally:
+        schema_mod._get_schema_for_version.cache_clear()
+
+
+def test_changed_schemas_are_validated_by_their_new_content() -> None:
+    """Test that changing a caller's schema after validating against it takes effect on the next validation."""
+    schema: dict[str, Any] = {"title": "changed schema", "type": "object", "properties": {"version": {"type": "integer"}}}
+    document = {"version": 4, "name": "x"}
+
+    validate_json_against_schema(document, schema)
+
+    schema["additionalProperties"] = False
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        validate_json_against_schema(document, schema)
+
+
+def test_version_validators_only_for_version_split_schemas() -> None:
+    """Test that per-version validators are only built when every variant pins a version."""
+    variant = {"properties": {"version": {"const": 2}, "name": {"type": "string"}}, "additionalProperties": False}
+    schema = {"type": "object", "oneOf": [variant]}
+
+    validators = _get_version_validators(schema)
+    assert set(validators) == {2}
+    assert validators[2].is_valid({"version": 2, "name": "x"})
+    assert not validators[2].is_valid({"version": 2, "name": 1})
+
+    assert _get_version_validators({"oneOf": [variant, {"properties": {}}]}) == {}
+
+
+def test_latest_master_schema_is_reused_until_cache_changes(fs: FakeFilesystem) -> None:
+    """Test that the cached master schema is parsed once and re-read when the file changes."""
+    cache_file = Path.home() / ".cache" / "cmakepresets-schema" / "schema.json"
+    fs.create_file(cache_file, contents=json.dumps({"oneOf": []}))
+
+    first = _get_latest_master_schema()
+    assert _get_latest_master_schema() is first
+
+    cache_file.write_text(json.dumps({"oneOf": [], "description": "updated"}))
+    updated = _get_latest_master_schema()
+    assert updated is not first
+    assert updated["description"] == "updated"
+
+
+def test_latest_master_schema_is_owned_by_the_caller(fs: FakeFilesystem) -> None:
+    """Test that changing a returned master schema leaves the in-process copy and later results unchanged."""
+    cache_file = Path.home() / ".cache" / "cmakepresets-schema" / "schema.json"
+    fs.create_file(cache_file, contents=json.dumps({"oneOf": [], "description": "cached"}))
+
+    schema = get_latest_master_schema()
+    schema["description"] = "changed"
+    schema["oneOf"].append({})
+
+    assert get_latest_master_schema() == {"oneOf": [], "description": "cached"}
+    assert _get_latest_master_schema() == {"oneOf": [], "description": "cached"}
+
+
+def test_import_does_not_load_validation_or_download_dependencies() -> None:
+    """Importing the package should not import jsonschema or requests until they are needed."""
+    code = "import sys, cmakepresets.cli; print(sorted({'jsonschema', 'requests'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_valid_documents_are_remembered_per_schema() -> None:
+    """Test that only successfully validated documents are remembered for a schema."""
+    schema = {"title": "remembered documents", "type": "object", "properties": {"version": {"type": "integer"}}}
+
+    validate_json_against_schema({"version": 4, "include": []}, schema)
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        validate_json_against_schema({"version": "4"}, schema)
+
+    validated = _get_validated_documents(schema)
+    assert _get_document_key({"include": [], "version": 4}) in validated
+    assert _get_document_key({"version": "4"}) not in validated
+    assert _get_validated_documents(dict(schema)) is validated
+    assert _get_validated_documents({**schema, "title": "other documents"}) == set()
+
+
+def test_validate_without_schema_uses_schema_for_document_version(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that omitting the schema loads the document version's schema once and reuses it."""
+    requested: list[int] = []
+    version_schema = {"type": "object", "properties": {"version": {"const": 4}}}
+
+    def fake_get_schema(version: int) -> dict[str, Any]:
+        requested.append(version)
+        return version_schema
+
+    monkeypatch.setattr(schema_mod, "get_schema", fake_get_schema)
+    schema_mod._get_schema_for_version.cache_clear()
+    try:
+        validate_json_against_schema({"version": 4})
+        validate_json_against_schema({"version": 4, "include": []})
+        with pytest.raises(VersionError):
+            validate_json_against_schema({})
+    finally:
+        schema_mod._get_schema_for_version.cache_clear()
+
+    assert requested == [4]
@@ -1,32 +1,129 @@
+import json
+from pathlib import Path
+from typing import Any
+
 import pytest
 import requests
+from pyfakefs.fake_filesystem import FakeFilesystem
 
+from cmakepresets import __version__
 from cmakepresets import schema as schema_mod
+from cmakepresets.exceptions import SchemaDownloadError
 
 
-def test_get_schema_uses_local_fallback_on_download_failure(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Simulate requests.get failing with OSError and then a RequestException on retry.
+@pytest.mark.parametrize(
+    "retry_error",
+    [requests.RequestException("simulated download failure"), OSError("simulated retry failure")],
+)  # type: ignore[misc]
+def test_get_schema_uses_local_fallback_on_download_failure(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, retry_error: Exception) -> None:
+    """Simulate schema downloads failing with OSError and then again on retry.
 
     Under pytest the module checks sys.modules and will use the local fallback
     schema when downloads fail. Ensure get_schema() returns the fallback schema
     (which contains a 'oneOf' top-level key) instead of raising.
     """
 
-    call_count = {"n": 0}
+    call_count = 0
 
     def fake_get(*args: object, **kwargs: object) -> object:
         # First call raises OSError (simulating certifi CA bundle path problem)
-        # Second call raises a generic requests exception (retry failure).
-        call_count["n"] += 1
-        if call_count["n"] == 1:
+        # Second call raises the retry failure being tested.
+        nonlocal call_count
+        call_count += 1
+        if call_count == 1:
             raise OSError("simulated certifi CA bundle missing")
-        raise requests.RequestException("simulated download failure")
+        raise retry_error
 
-    monkeypatch.setattr(requests, "get", fake_get)
+    monkeypatch.setattr(schema_mod._get_session(), "get", fake_get)
+    # Start without a schema cache so the download is attempted
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
 
     # Should not raise; should return the local fallback schema
     schema = schema_mod.get_schema(4)
 
+    assert call_count == 2
+
     assert isinstance(schema, dict)
     # Our fallback schema is minimal and contains a top-level 'oneOf'
     assert "oneOf" in schema
+
+
+def test_master_schema_download_uses_conditional_request(monkeypatch: pytest.MonkeyPatch, fs: FakeFilesystem) -> None:
+    """A previously seen ETag is sent back and a 304 response reuses the cached schema."""
+    sent_headers: list[dict[str, str]] = []
+
+    def fake_get(url: str, **kwargs: Any) -> requests.Response:
+        headers = kwargs.get("headers") or {}
+        sent_headers.append(headers)
+        response = requests.Response()
+        response.url = url
+        if headers.get("If-None-Match") == '"v1"':
+            response.status_code = 304
+        else:
+            response.status_code = 200
+            response.headers["ETag"] = '"v1"'
+            response._content = json.dumps({"oneOf": [], "description": "downloaded"}).encode()
+        return response
+
+    monkeypatch.setattr(schema_mod._get_session(), "get", fake_get)
+
+    first = schema_mod.get_latest_master_schema(force_download=True)
+    second = schema_mod.get_latest_master_schema(force_download=True)
+
+    assert sent_headers == [{}, {"If-None-Match": '"v1"'}]
+    assert first == second == {"oneOf": [], "description": "downloaded"}
+
+
+def test_download_session_is_shared() -> None:
+    """Schema downloads share one session identifying the package."""
+    session = schema_mod._get_session()
+
+    assert schema_mod._get_session() is session
+    assert session.headers["User-Agent"] == f"cmakepresets/{__version__}"
+
+
+def test_get_schema_uses_bundled_schema_when_offline(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """With downloads disabled, schemas missing from the cache come from the bundled file without any request."""
+
+    def fake_get(*args: object, **kwargs: object) -> object:
+        raise AssertionError("no download expected while offline")
+
+    monkeypatch.setattr(schema_mod._get_session(), "get", fake_get)
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    monkeypatch.setenv("CMAKEPRESETS_OFFLINE", "1")
+
+    assert schema_mod.schema_has_version(schema_mod.get_schema(4), 4)
+
+    with pytest.raises(SchemaDownloadError, match="downloads are disabled"):
+        schema_mod.get_schema(5)
+    with pytest.raises(SchemaDownloadError, match="downloads are disabled"):
+        schema_mod.get_latest_master_schema()
+
+
+def test_get_schema_downloads_fresh_copy_when_cache_lacks_version(monkeypatch: pytest.MonkeyPatch, fs: FakeFilesystem) -> None:
+    """A cached schema rejected for the requested version is not revalidated, so a 304 cannot hand it back."""
+    home = Path("/home/test")
+    cache_file = home / ".cache" / "cmakepresets-schema" / "schema-v4.json"
+    fs.create_file(cache_file, contents=json.dumps({"oneOf": [{"properties": {"version": {"const": 2}}}]}))
+    fs.create_file(cache_file.with_name("schema-v4.meta.json"), contents=json.dumps({"etag": '"stale"', "last_modified": None}))
+    fresh = {"oneOf": [{"properties": {"version": {"const": 4}}}]}
+    sent_headers: list[dict[str, str]] = []
+
+    def fake_get(url: str, **kwargs: Any) -> requests.Response:
+        headers = kwargs.get("headers") or {}
+        sent_headers.append(headers)
+        response = requests.Response()
+        response.url = url
+        if headers.get("If-None-Match") == '"stale"':
+            response.status_code = 304
+        else:
+            response.status_code = 200
+            response._content = json.dumps(fresh).encode()
+        return response
+
+    monkeypatch.setattr(schema_mod._get_session(), "get", fake_get)
+    monkeypatch.setattr(Path, "home", lambda: home)
+
+    assert schema_mod.get_schema(4) == fresh
+    assert sent_headers == [{}]
+    assert json.loads(cache_file.read_text()) == fresh
@@ -1,8 +1,9 @@
+import os
 from pathlib import Path
 
 import pytest
 
-from cmakepresets.utils import read_file_text, write_file_text
+from cmakepresets.utils import read_file_bytes, read_file_text, write_file_bytes_atomic, write_file_text
 
 
 def test_read_write_file_text(tmp_path: Path) -> None:
@@ -17,7 +18,53 @@ def test_read_write_file_text(tmp_path: Path) -> None:
     # Test read_file_text
     content = read_file_text(test_file)
     assert content == test_content
+    assert read_file_bytes(test_file) == test_content.encode("utf-8")
 
     # Test with non-existent file should raise
     with pytest.raises(FileNotFoundError):
         read_file_text(tmp_path / "nonexistent.txt")
+
+
+def test_write_file_bytes_atomic(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test write_file_bytes_atomic replaces the file without leaving a temp file behind."""
+    test_file = tmp_path / "test.json"
+    test_file.write_text("old")
+
+    write_file_bytes_atomic(test_file, b'{"new": true}')
+
+    assert read_file_text(test_file) == '{"new": true}'
+    assert [p.name for p in tmp_path.iterdir()] == ["test.json"]
+
+    # Failed writes leave the original file untouched and remove their temporary file
+    def fail_replace(src: object, dst: object) -> None:
+        raise OSError("simulated replace failure")
+
+    with monkeypatch.context() as m:
+        m.setattr(os, "replace", fail_replace)
+        with pytest.raises(OSError, match="simulated replace failure"):
+            write_file_bytes_atomic(test_file, b"{}")
+    assert read_file_text(test_file) == '{"new": true}'
+    assert [p.name for p in tmp_path.iterdir()] == ["test.json"]
+
+    with pytest.raises(OSError):
+        write_file_bytes_atomic(tmp_path / "missing" / "test.json", b"{}")
+    assert not (tmp_path / "missing").exists()
+
+
+def test_write_file_bytes_atomic_uses_unique_temp_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that each write goes through its own temporary file, so concurrent writers cannot share one."""
+    test_file = tmp_path / "test.json"
+    temp_files: list[str] = []
+    real_replace = os.replace
+
+    def record_replace(src: str, dst: Path) -> None:
+        temp_files.append(src)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", record_replace)
+    write_file_bytes_atomic(test_file, b"1")
+    write_file_bytes_atomic(test_file, b"2")
+
+    assert len(set(temp_files)) == 2
+    assert all(Path(name).parent == tmp_path for name in temp_files)
+    assert read_file_text(test_file) == "2"